@@ -2,27 +2,30 @@
 """
 Main tools
 """
-import sys
+import argparse
 import os
 import logging
 import pdb
-from collections import OrderedDict
-from tkinter import ttk
 
 from tools.logger import logger, change_logger_level
-from tools import __help__
+from tools import __help__, verify_imports
 
-# Manage command line arguments
-user_args = sys.argv[1:]
-if '--debug' in user_args:
-    change_logger_level(logging.DEBUG, logger=logger)
-    DEBUG_MODE = True
-    logger.info("Debug mode activated!")
-else:
-    change_logger_level(logging.INFO, logger=logger)
-    DEBUG_MODE = False
 
-# Other imports
+def _parse_cli_once():
+    """Manage command line arguments. Called once, under the __main__ guard, so that reloading modules
+    doesn't reset the logger level.
+
+    :return: True if debug mode is activated, else False
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('--debug', action='store_true')
+    args, _ = parser.parse_known_args()
+    if args.debug:
+        change_logger_level(logging.DEBUG, logger=logger)
+        logger.info("Debug mode activated!")
+    else:
+        change_logger_level(logging.INFO, logger=logger)
+    return args.debug
 
 
 TITLE = "Main window"
@@ -36,7 +39,7 @@ def reload_all_modules():
     reload_modules([], reload_func=True, ls_func_names='FUNCTIONS')
 
 
-def reload_main(win, debug_mode=DEBUG_MODE, reload_modules=True):
+def reload_main(win, debug_mode=False, reload_modules=True):
     if win.on_closing():
         if reload_modules:
             reload_all_modules()
@@ -62,15 +65,16 @@ def debugger():
         logger.exception(err)
 
 
-def main(debug_mode=DEBUG_MODE):
+def main(debug_mode=False):
     # Imports are at this level, in case modules are reloaded.
+    from tkinter import ttk
     from tools.helpers.interface import MainTk
     # import functions here:
     from scripts import FUNCTIONS
     # import debug functions here:
     DEBUG_FUNCTIONS = []
-    parts = OrderedDict([("sample functions", FUNCTIONS),
-                        ])  # add functions here
+    parts = {"sample functions": FUNCTIONS,
+             }  # add functions here
     if debug_mode:
         parts['Debugging (developer only)'] = DEBUG_FUNCTIONS  # add debug functions here
     logger_level = logging.DEBUG if debug_mode else logging.INFO
@@ -98,5 +102,6 @@ def main(debug_mode=DEBUG_MODE):
 
 if __name__ == '__main__':
     logger.info('Start of the program.')
-    main()
+    verify_imports()  # required third-party modules, checked before the interface is imported
+    main(debug_mode=_parse_cli_once())
     logger.info('End of the program.')
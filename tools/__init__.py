@@ -3,63 +3,49 @@
 """
 Tools.
 """
-import pdb
+import importlib
+import sys
 
 __id_filename__ = ".ID_tools-3DF36B5D-694A-4743-96A4-C02B269C95D5"  # must be before logger import
 
 from tools.logger import logger  # import logger and set default working directory
 
-# try to import required modules
-_msg_ptrn = " ok"
-test_lib = '[nothing tested yet]'
-try:
-    # numpy
-    test_lib = 'numpy'
-    import numpy
+# heavy third-party modules, imported on first attribute access (PEP 562)
+_LAZY_MODULES = ('numpy', 'pandas', 'matplotlib', 'seaborn', 'pptx')
+# modules checked by verify_imports
+_REQUIRED_MODULES = ('numpy', 'pandas', 'matplotlib', 'matplotlib.pyplot', 'matplotlib.patches', 'seaborn', 'pptx')
+
+
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        module = importlib.import_module(name)
+        globals()[name] = module
+        return module
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def verify_imports():
+    """Try to import required modules. On failure, errors are logged and the Python debugger is opened
+    (in interactive sessions only, otherwise the ImportError is raised)."""
+    test_lib = '[nothing tested yet]'
+    try:
+        for test_lib in _REQUIRED_MODULES:
+            importlib.import_module(test_lib)
+            logger.debug("%s ok", test_lib)
+    except ImportError as err:
+        logger.error("Error while trying to import Python modules! Failed to import '{}'.".format(test_lib))
+        logger.error(err)
+        if 'DLL load failed' in str(err):
+            logger.error("Error may be linked to Anaconda distribution.\n"
+                         "Try to use pip instead of conda to install modules or use a virtualenv")
+        logger.exception(err)
+        # no debugger in non-interactive runs (streams are None with pythonw)
+        if not (sys.stdin is not None and sys.stderr is not None and sys.stdin.isatty() and sys.stderr.isatty()):
+            raise
+        import pdb
+        print("Opening Python debugger...")
+        pdb.set_trace()
 
-    logger.debug(_msg_ptrn.format(test_lib))
-
-    # pandas
-    test_lib = 'pandas'
-    import pandas
-
-    logger.debug(_msg_ptrn.format(test_lib))
-
-    # matplotlib
-    test_lib = 'matplotlib'
-    import matplotlib
-
-    logger.debug(_msg_ptrn.format(test_lib))
-    test_lib = 'matplotlib.pyplot'
-    import matplotlib.pyplot
-
-    logger.debug(_msg_ptrn.format(test_lib))
-    test_lib = 'matplotlib.patches'
-    import matplotlib.patches
-
-    logger.debug(_msg_ptrn.format(test_lib))
-
-    # seaborn
-    test_lib = 'seaborn'
-    import seaborn
-
-    logger.debug(_msg_ptrn.format(test_lib))
-
-    # python-pptx
-    test_lib = 'pptx'
-    import pptx
-
-    logger.debug(_msg_ptrn.format(test_lib))
-    test_lib = 'all libraries ok'
-except ImportError as err:
-    logger.error("Error while trying to import Python modules! Failed to import '{}'.".format(test_lib))
-    logger.error(err)
-    if 'DLL load failed' in str(err):
-        logger.error("Error may be linked to Anaconda distribution.\n"
-                     "Try to use pip instead of conda to install modules or use a virtualenv")
-    logger.exception(err)
-    print("Opening Python debugger...")
-    pdb.set_trace()
 
 __version__ = '1.3.0'
 __description__ = "Main tools"
@@ -3,50 +3,72 @@
 """
 Simple functions to manipulate dataframes with a user interface.
 """
+import numpy as np
 import pandas as pd
-from collections import OrderedDict
 
 from tools.logger import logger
 from tools.helpers.interface import simpledialog, messagebox
 
 
+def _sorted_unique_values(serie):
+    """Returns the sorted unique values of a serie (missing values, if any, are the last value)"""
+    col_type = serie.dtype
+    values = serie.dropna().unique()
+    is_datetime = pd.api.types.is_datetime64_any_dtype(col_type)
+    if pd.api.types.is_numeric_dtype(col_type):
+        values = np.sort(values).tolist()
+    elif is_datetime:
+        values = pd.DatetimeIndex(values).sort_values().tolist()
+    else:
+        values = sorted(values)
+    if serie.hasnans:  # missing values can be selected too
+        values.append(pd.NaT if is_datetime else np.nan)
+    return values
+
+
 # Selections
 def dataframe_column_selection(df):
     """Select certain certain columns of a dataframe"""
-    columns = list(df.columns)
+    columns = df.columns.tolist()
     columns_to_filter = simpledialog.ask_multiple_questions(message="Select the columns to keep",
                                                             initial_status=False,
                                                             choices={'columns': columns})
     if columns_to_filter is None:
         return df
     columns_to_filter = columns_to_filter['columns']
-    n_df = df[columns_to_filter]
+    if not columns_to_filter:
+        return df.iloc[:, :0]
+    n_df = df.loc[:, columns_to_filter]
     return n_df
 
 
 def dataframe_values_selection(df, columns):
     """Select certain lines of a dataframe considering specific values of certain columns"""
     columns = [columns] if isinstance(columns, str) else columns
-    choices = OrderedDict([(col, sorted(set(df[col]))) for col in columns if col in df.columns])
+    choices = {col: _sorted_unique_values(df[col]) for col in columns if col in df.columns}
     res = simpledialog.ask_multiple_questions(message="Select the values to keep", choices=choices)
-    for col, values in res.items():
-        df = df[df[col].isin(values)]
+    mask = None
+    for col, values in res.items():  # combine masks inplace in a single boolean array
+        if mask is None:
+            mask = df[col].isin(values).to_numpy(copy=True)
+        else:
+            np.logical_and(mask, df[col].isin(values).to_numpy(), out=mask)
+    if mask is not None:  # filter all columns at once to avoid intermediate copies of the dataframe
+        df = df[mask]
     return df
 
 
 # Group by
 def dataframe_groupby(df, synthesis_col=None, agg_dict=None, agg_methods=None):
     """Group by the columns selected by the user."""
-    columns = list(df.columns)
+    columns = df.columns.tolist()
     agg_methods = agg_methods or ['first', 'last', 'count', 'nunique', 'sum', 'mean', 'min', 'max']
     synthesis_col = synthesis_col or df.columns
 
-    choices = OrderedDict([('columns_to_group', {'choices': columns, 'name': 'Columns to group'}),
-                           ('agg_methods', {'choices': agg_methods, 'name': 'Aggregation methods',
-                                            'initial_status': True}),
-                           ('synt_columns', {'choices': synthesis_col, 'name': 'Columns to aggregate',
-                                             'initial_status': True}),
-                           ])
+    choices = {'columns_to_group': {'choices': columns, 'name': 'Columns to group'},
+               'agg_methods': {'choices': agg_methods, 'name': 'Aggregation methods', 'initial_status': True},
+               'synt_columns': {'choices': synthesis_col, 'name': 'Columns to aggregate', 'initial_status': True},
+               }
     res = simpledialog.ask_multiple_questions(message="Select the columns to group",
                                               initial_status=False,
                                               choices=choices)
@@ -57,7 +79,8 @@ def dataframe_groupby(df, synthesis_col=None, agg_dict=None, agg_methods=None):
     synthesis_col = res['synt_columns']
     if not columns_to_group:
         return df
-    agg_dict = agg_dict or {col: agg_methods for col in synthesis_col if col not in columns_to_group}
+    group_cols_set = set(columns_to_group)
+    agg_dict = agg_dict or {col: agg_methods for col in synthesis_col if col not in group_cols_set}
     n_df = df.groupby(columns_to_group).agg(agg_dict).reset_index()
     return n_df
 
@@ -68,8 +91,8 @@ def dataframe_describe(df, columns=None):
     if columns is None:
         columns = df.columns
     else:
-        columns = [columns] if isinstance(columns, str) else columns
-        columns = [ele for ele in columns if ele in df.columns]
+        columns = pd.Index([columns] if isinstance(columns, str) else columns)
+        columns = columns[columns.isin(df.columns)]
     res = df[columns].describe().round(2)
     return res
 
@@ -79,7 +102,7 @@ def dataframe_quick_analysis(df):
     df = dataframe_column_selection(df)
     columns_to_filter = simpledialog.ask_multiple_questions(message="Select columns to filter",
                                                             initial_status=False,
-                                                            choices={'columns': list(df.columns)})
+                                                            choices={'columns': df.columns.tolist()})
     if columns_to_filter and columns_to_filter['columns']:
         df = dataframe_values_selection(df, columns_to_filter['columns'])
     df = dataframe_groupby(df)
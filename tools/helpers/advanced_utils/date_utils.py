@@ -10,20 +10,60 @@ Utils to manipulate dates:
 - get a list of multiple periods
 - support of datetime objects, pandas timestamps, series and dataframes (most cases)
 """
+import calendar
 import datetime
+import functools
 from typing import Union
 import pandas as pd
 import numpy as np
 
 from tools.helpers.interface import simpledialog
-from tools.helpers.utils.decorators import handle_datetime_dataframe, handle_datetime_pandas_objects
+from tools.helpers.utils.decorators import handle_datetime_dataframe
 
 STRFTIME_DICT = {'year': "%Y", "month": "%Y-%m", "quarter": "%Y-%m",
                  "week": "%Y-W%W",  # WARN: week format don't respect ISO 8601 here
                  "day": "%Y-%m-%d", None: "%Y-%m-%d",
                  "hour": "%H:%M", "minute": "%H:%M", "second": "%H:%M:%S"}
 
-# todo: integrate pandas.date_range
+# Length of periods. Calendar periods (year, quarter, month) are DateOffsets: add them to an origin date,
+# not step by step (days of month would drift at month ends).
+PERIOD_OFFSETS = {'year': pd.DateOffset(years=1), 'quarter': pd.DateOffset(months=3), 'month': pd.DateOffset(months=1),
+                  'week': pd.Timedelta(weeks=1), 'day': pd.Timedelta(days=1), 'hour': pd.Timedelta(hours=1),
+                  'minute': pd.Timedelta(minutes=1), 'second': pd.Timedelta(seconds=1)}
+# Fixed-length periods: adding n periods is a multiplication of a precomputed timedelta
+_TIMEDELTA_OFFSETS = {key: offset for key, offset in PERIOD_OFFSETS.items() if isinstance(offset, pd.Timedelta)}
+
+
+@functools.lru_cache(maxsize=4096)
+def _to_datetime_scalar(date):
+    return pd.to_datetime(date)
+
+
+def _to_datetime(date):
+    """pd.to_datetime with a cache for naive scalar dates (strings, dates and datetimes, pandas timestamps).
+    Aware datetimes are not cached: equal instants in different time zones have the same hash.
+
+    >>> utc = datetime.datetime(2020, 1, 1, 23, 30, tzinfo=datetime.timezone.utc)
+    >>> _to_datetime(utc)
+    Timestamp('2020-01-01 23:30:00+0000', tz='UTC')
+    >>> _to_datetime(utc.astimezone(datetime.timezone(datetime.timedelta(hours=2))))
+    Timestamp('2020-01-02 01:30:00+0200', tz='UTC+02:00')
+    """
+    if isinstance(date, (str, datetime.date)) and date is not pd.NaT and getattr(date, 'tzinfo', None) is None:
+        return _to_datetime_scalar(date)
+    return pd.to_datetime(date)
+
+# Number of nanoseconds in fixed-length periods (deltas are computed on int64 nanoseconds)
+_NS_PER_DAY = 86400 * 10 ** 9
+_NS_PER_UNIT = {'day': _NS_PER_DAY, 'hour': 3600 * 10 ** 9, 'minute': 60 * 10 ** 9, 'second': 10 ** 9}
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()  # proleptic Gregorian ordinal of day 0 of nanoseconds
+
+# Pandas frequencies used to get the first date of a period
+_PERIOD_FREQ = {'year': 'Y', 'quarter': 'Q', 'month': 'M'}
+# Precomputed first dates of periods (int64 nanoseconds, sorted) to reset series with a binary search
+_PERIOD_STARTS = {period_type: pd.date_range('1900-01-01', '2100-01-01', freq=freq).to_numpy(dtype='datetime64[ns]')
+                  .view(np.int64) for period_type, freq in (('month', 'MS'), ('quarter', 'QS'))}
+
 
 # Reset time
 @handle_datetime_dataframe
@@ -31,17 +71,17 @@ def reset_timing(date: Union[pd.DataFrame, pd.Series, datetime.datetime],
                  inplace=False) -> Union[pd.DataFrame, pd.Series, datetime.datetime]:
     """Set time to 00:00:00"""
     if isinstance(date, pd.Series):
-        date = pd.to_datetime(date)
-        return pd.to_datetime(date.dt.date)
-    return pd.to_datetime(date.date()) if date is not None else None
+        return pd.to_datetime(date).dt.normalize()
+    if date is None:
+        return None
+    date = _to_datetime(date)
+    return date if date is pd.NaT else date.normalize()
 
 
 # Get quarter
-@handle_datetime_dataframe
-def get_quarter(date: datetime.datetime, inplace=False):
+def get_quarter(date: Union[pd.DataFrame, pd.Series, datetime.datetime], inplace=False):
     """Returns the quarter of a date
 
-    # >>> get_quarter = handle_datetime_dataframe(get_quarter)  # apply decorator for doctest
     >>> date = datetime.datetime(2019, 4, 5, 8, 2, 3)
     >>> get_quarter(date)
     2
@@ -59,7 +99,17 @@ def get_quarter(date: datetime.datetime, inplace=False):
     >>> date
        0
     0  4
+
+    :param date: date, pandas Serie or DataFrame of dates
+    :param inplace: if date is a dataframe and inplace is True, convert columns inplace
+    :return: quarter(s) of the date(s)
     """
+    if isinstance(date, pd.DataFrame):  # vectorized column by column
+        quarters = date.apply(lambda col: pd.to_datetime(col).dt.quarter)
+        if inplace:
+            date[date.columns] = quarters
+            return None
+        return quarters
     if isinstance(date, pd.Series):
         date = pd.to_datetime(date)
         return (pd.to_datetime(date).dt.month - 1) // 3 + 1
@@ -67,12 +117,11 @@ def get_quarter(date: datetime.datetime, inplace=False):
 
 
 # Add periods
-@handle_datetime_pandas_objects
+@handle_datetime_dataframe
 def add_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None], number_of_period=0,
                period_type=None, reset_time=False, output_type=pd.Timestamp, inplace=False, **kwargs):
     """Add a certain number of periods (year, month, week, day, hour, minute, second) to the input date.
 
-    >>> add_period = handle_datetime_pandas_objects(add_period)  # apply decorator for doctest
     >>> date = datetime.datetime(2019, 1, 5, 8, 2, 3)
     >>> add_period(date, 2, period_type='week', reset_time=True)
     Timestamp('2019-01-19 00:00:00')
@@ -88,6 +137,8 @@ def add_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None], nu
     0 2019-02-02
     >>> add_period(None, 4, period_type='week', reset_time=True)
     NaT
+    >>> add_period(datetime.datetime(2020, 1, 31), 1, period_type='month')  # days out of range: last day of month
+    Timestamp('2020-02-29 00:00:00')
 
     :param date: initial date
     :param number_of_period: number of periods to add
@@ -98,34 +149,49 @@ def add_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None], nu
     :param kwargs: keyword arguments (unused)
     :return: date of type output_type
     """
+    if date is None or date is pd.NaT:
+        return output_type(pd.NaT)
+    if isinstance(date, pd.Series):
+        return _add_period_series(date, number_of_period=number_of_period, period_type=period_type,
+                                  reset_time=reset_time, output_type=output_type)
+    if isinstance(date, list):
+        return [add_period(ele, number_of_period=number_of_period, period_type=period_type,
+                           reset_time=reset_time, output_type=output_type, **kwargs) for ele in date]
+    date = _to_datetime(date)
+    if period_type in _TIMEDELTA_OFFSETS:
+        n_date = date + number_of_period * _TIMEDELTA_OFFSETS[period_type]
+    elif period_type is None:
+        n_date = date
+    elif period_type in ('year', 'month', 'quarter'):
+        number_of_months = {'year': 12, 'quarter': 3, 'month': 1}[period_type] * number_of_period
+        n_year = date.year + (date.month + number_of_months - 1) // 12
+        n_month = (date.month + number_of_months) % 12 or 12
+        n_day = min(date.day, calendar.monthrange(n_year, n_month)[1])  # e.g. 31st of January + 1 month: 28th
+        n_date = date.replace(year=n_year, month=n_month, day=n_day)
+    else:
+        raise NotImplementedError("period_type '{}' not valid!".format(period_type))
+    n_date = reset_timing(n_date) if reset_time else n_date
+    return output_type(n_date)
+
+
+def _add_period_series(date: pd.Series, number_of_period=0, period_type=None, reset_time=False,
+                       output_type=pd.Timestamp) -> pd.Series:
+    """Vectorized version of add_period for pandas Series."""
     date = pd.to_datetime(date)
-    if period_type is None:
+    if period_type in _TIMEDELTA_OFFSETS:
+        n_date = date + number_of_period * _TIMEDELTA_OFFSETS[period_type]
+    elif period_type is None:
         n_date = date
     elif period_type == 'year':
-        n_year = date.year + number_of_period
-        n_date = date.replace(year=n_year)
-    elif period_type == 'month':
-        n_year = date.year + (date.month + number_of_period - 1) // 12
-        n_month = (date.month + number_of_period) % 12 or 12
-        n_date = date.replace(month=n_month)
-        n_date = n_date.replace(year=n_year)
+        n_date = date + pd.DateOffset(years=number_of_period)
     elif period_type == 'quarter':
-        return add_period(date, number_of_period=3 * number_of_period, period_type='month',
-                          reset_time=reset_time, output_type=output_type, **kwargs)
-    elif period_type == 'week':
-        n_date = date + pd.Timedelta(weeks=number_of_period)
-    elif period_type == 'day':
-        n_date = date + pd.Timedelta(days=number_of_period)
-    elif period_type == 'hour':
-        n_date = date + pd.Timedelta(hours=number_of_period)
-    elif period_type == 'minute':
-        n_date = date + pd.Timedelta(minutes=number_of_period)
-    elif period_type == 'second':
-        n_date = date + pd.Timedelta(seconds=number_of_period)
+        n_date = date + pd.DateOffset(months=3 * number_of_period)
+    elif period_type == 'month':
+        n_date = date + pd.DateOffset(months=number_of_period)
     else:
         raise NotImplementedError("period_type '{}' not valid!".format(period_type))
     n_date = reset_timing(n_date) if reset_time else n_date
-    return output_type(n_date)
+    return n_date if output_type is pd.Timestamp else n_date.apply(output_type)
 
 
 def add_month(date, number_of_months=0, reset_time=False, output_type=pd.Timestamp, **kwargs):
@@ -142,7 +208,7 @@ def add_week(date, number_of_weeks=0, reset_time=False, output_type=pd.Timestamp
 
 
 # Get first date of a period
-@handle_datetime_pandas_objects
+@handle_datetime_dataframe
 def reset_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None],
                  period_type: str, offset: int = 0, reset_time=True,
                  inplace=False) -> Union[pd.DataFrame, pd.Series, datetime.datetime, None]:
@@ -158,7 +224,11 @@ def reset_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None],
     """
     if date is None or date is pd.NaT:
         return date
-    date = pd.to_datetime(date)
+    if isinstance(date, pd.Series):
+        return _reset_period_series(date, period_type=period_type, offset=offset, reset_time=reset_time)
+    if isinstance(date, list):
+        return [reset_period(ele, period_type=period_type, offset=offset, reset_time=reset_time) for ele in date]
+    date = _to_datetime(date)
     n_date = add_period(date, offset, period_type=period_type)
     if period_type == 'year':
         n_date = n_date.replace(month=1, day=1)
@@ -169,7 +239,7 @@ def reset_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None],
     elif period_type == 'day':
         n_date = reset_timing(n_date)
     elif period_type == 'hour':
-        n_date = n_date.replace(minute=1, second=0, microsecond=0)
+        n_date = n_date.replace(minute=0, second=0, microsecond=0)
     elif period_type == 'minute':
         n_date = n_date.replace(second=0, microsecond=0)
     elif period_type == 'second':
@@ -182,6 +252,64 @@ def reset_period(date: Union[pd.DataFrame, pd.Series, datetime.datetime, None],
     return n_date
 
 
+def _reset_period_series(date: pd.Series, period_type: str, offset: int = 0, reset_time=True) -> pd.Series:
+    """Vectorized version of reset_period for pandas Series."""
+    date = pd.to_datetime(date)
+    if date.dt.tz is not None and (period_type == 'week' or period_type in _PERIOD_FREQ):
+        # vectorized paths below compute calendar days of naive dates: element by element for aware dates
+        return date.map(lambda ele: reset_period(ele, period_type=period_type, offset=offset, reset_time=reset_time))
+    if period_type == 'week':
+        n_date = pd.Series(_first_day_of_week(date.to_numpy(dtype='datetime64[D]'), offset),
+                           index=date.index, name=date.name)
+        if not reset_time:  # keep time of the day
+            n_date += date - date.dt.normalize()
+    elif period_type in _PERIOD_FREQ:
+        n_date = _search_period_starts(date, period_type, offset=offset)
+        if n_date is None:  # not precomputed or out of range
+            n_date = (date.dt.to_period(_PERIOD_FREQ[period_type]) + offset).dt.start_time
+        if not reset_time:  # keep time of the day
+            n_date += date - date.dt.normalize()
+    elif period_type == 'day':
+        n_date = date.dt.normalize() + pd.Timedelta(days=offset)
+    elif period_type in ('hour', 'minute', 'second'):
+        n_date = _add_period_series(date, offset, period_type=period_type).dt.floor(PERIOD_OFFSETS[period_type])
+    else:
+        raise NotImplementedError("period_type '{}' not implemented".format(period_type))
+    n_date = reset_timing(n_date) if reset_time else n_date
+    return n_date
+
+
+def _search_period_starts(date: pd.Series, period_type: str, offset: int = 0) -> Union[pd.Series, None]:
+    """First dates of the periods of a serie of dates, found by binary search in _PERIOD_STARTS.
+    Returns None if period_type is not precomputed or if a date (or its offset) is out of the precomputed range."""
+    starts = _PERIOD_STARTS.get(period_type)
+    if starts is None or date.dt.tz is not None:
+        return None
+    nat = date.isna().to_numpy()
+    index = np.searchsorted(starts, _to_ns(date), side='right') - 1
+    checked = index[~nat]
+    if checked.size and (checked.min() < max(0, -offset) or checked.max() > min(len(starts) - 2,
+                                                                              len(starts) - 1 - offset)):
+        return None
+    first_dates = starts[np.clip(index + offset, 0, len(starts) - 1)]
+    first_dates[nat] = np.iinfo(np.int64).min  # NaT
+    return pd.Series(first_dates.view('datetime64[ns]'), index=date.index, name=date.name)
+
+
+def _first_day_of_week(days: np.ndarray, offset: int = 0) -> np.ndarray:
+    """Mondays of the weeks of an array of days (datetime64[D]) with an offset of 'offset' week(s).
+    Integer arithmetic only: 1970-01-01 (day 0) is a thursday. NaT values are kept.
+
+    >>> mondays = _first_day_of_week(np.array(['2018-12-30', '2019-01-01', 'NaT'], dtype='datetime64[D]'), offset=1)
+    >>> mondays.astype('datetime64[D]').tolist()
+    [datetime.date(2018, 12, 31), datetime.date(2019, 1, 7), None]
+    """
+    ordinals = days.view(np.int64)
+    mondays = ordinals - (ordinals + 3) % 7 + 7 * offset
+    mondays[np.isnat(days)] = np.iinfo(np.int64).min  # NaT
+    return mondays.view('datetime64[D]').astype('datetime64[ns]')
+
+
 def reset_week(date: datetime.datetime, week_offset: int = 0, reset_time=True) -> datetime.datetime:
     """Get the first day of the week of 'date' with an offset of 'week_offset' week(s).
     Monday is the first day of week (following ISO 8601).
@@ -278,40 +406,27 @@ def datetime_delta(date_1: Union[pd.DataFrame, pd.Series, datetime.datetime, Non
     :param abs_val: if True, output is an absolute value
     :return: number of periods between date_1 and date_2 (subtraction)
     """
-    # Handle pandas dataframe type
+    # Handle pandas dataframe type: the dataframe is built at once from its columns
     if isinstance(date_1, pd.DataFrame) and isinstance(date_2, pd.DataFrame):
-        df = pd.DataFrame()
-        for col1, col2 in zip(date_1.columns, date_2.columns):
-            df[" - ".join([str(col2), str(col1)])] = datetime_delta(date_1[col1], date_2[col2],
-                                                                    period_type=period_type, abs_val=abs_val)
-        return df
+        return pd.DataFrame({" - ".join([str(col2), str(col1)]):
+                             datetime_delta(date_1[col1], date_2[col2], period_type=period_type, abs_val=abs_val)
+                             for col1, col2 in zip(date_1.columns, date_2.columns)})
     if isinstance(date_1, pd.DataFrame):
-        df = pd.DataFrame()
-        for col1 in date_1.columns:
-            df[" - ".join([str(date_2), str(col1)])] = datetime_delta(date_1[col1], date_2,
-                                                                      period_type=period_type, abs_val=abs_val)
-        return df
+        return pd.DataFrame({" - ".join([str(date_2), str(col1)]):
+                             datetime_delta(date_1[col1], date_2, period_type=period_type, abs_val=abs_val)
+                             for col1 in date_1.columns})
     if isinstance(date_2, pd.DataFrame):
-        df = pd.DataFrame()
-        for col2 in date_2.columns:
-            df[" - ".join([str(col2), str(date_1)])] = datetime_delta(date_1, date_2[col2],
-                                                                      period_type=period_type, abs_val=abs_val)
-        return df
+        return pd.DataFrame({" - ".join([str(col2), str(date_1)]):
+                             datetime_delta(date_1, date_2[col2], period_type=period_type, abs_val=abs_val)
+                             for col2 in date_2.columns})
     # Handle pandas serie type
-    if isinstance(date_1, pd.Series) and isinstance(date_2, pd.Series):
-        ls = []
-        for ele1, ele2 in zip(date_1, date_2):
-            ls.append(datetime_delta(ele1, ele2, period_type=period_type, abs_val=abs_val))
-        return pd.Series(ls)
-    if isinstance(date_1, pd.Series):
-        return date_1.apply(lambda x: datetime_delta(x, date_2, period_type=period_type, abs_val=abs_val))
-    if isinstance(date_2, pd.Series):
-        return date_2.apply(lambda x: datetime_delta(date_1, x, period_type=period_type, abs_val=abs_val))
+    if isinstance(date_1, pd.Series) or isinstance(date_2, pd.Series):
+        return _datetime_delta_series(date_1, date_2, period_type=period_type, abs_val=abs_val)
     # Calculate datetime deltas
-    if date_1 is None or date_2 is None:
+    if date_1 is None or date_2 is None or date_1 is pd.NaT or date_2 is pd.NaT:
         return np.nan
-    date_1 = pd.to_datetime(date_1)
-    date_2 = pd.to_datetime(date_2)
+    date_1 = _to_datetime(date_1)
+    date_2 = _to_datetime(date_2)
     if period_type == "year":
         res = date_2.year - date_1.year
     elif period_type == 'quarter':
@@ -323,29 +438,76 @@ def datetime_delta(date_1: Union[pd.DataFrame, pd.Series, datetime.datetime, Non
         res = 12 * (date_2.year - date_1.year) + (date_2.month - date_1.month)
     elif period_type == 'week':  # ISO 8601
         # res = 53 * (date_2.isocalendar()[0] - date_1.isocalendar()[0]) + (date_2.week - date_1.week)  # 52 or 53: No!
-        diff = (date_2 - date_1).days // 7
-        mod = (date_2 - date_1).days % 7
-        if date_1 > date_2:  # symmetrical role of date_1 and date_2
-            diff += 1
-            mod -= 7
-        # date_1 + datetime.timedelta(diff*7 + mod) == date_2 should be True
-        date_2_mod = date_1 + datetime.timedelta(days=mod)
-        res = diff \
-              - int(date_1.isocalendar()[:2] > date_2_mod.isocalendar()[:2]) \
-              + int(date_1.isocalendar()[:2] < date_2_mod.isocalendar()[:2])
-    elif period_type == 'day':
-        res = (date_2 - date_1).days
-    elif period_type == 'hour':
-        res = (date_2 - date_1).seconds * 3600
-    elif period_type == 'minute':
-        res = (date_2 - date_1).seconds * 60
-    elif period_type == 'second':
-        res = (date_2 - date_1).seconds
+        res = _week_delta(date_1.toordinal(), (date_2.value - date_1.value) // _NS_PER_DAY)
+    elif period_type in _NS_PER_UNIT:
+        res = (date_2.value - date_1.value) // _NS_PER_UNIT[period_type]
     else:
         raise NotImplementedError(period_type)
     return abs(res) if abs_val else res
 
 
+def _week_delta(ordinal, days):
+    """Number of weeks (Monday is the first day of week) between the day of proleptic Gregorian ordinal 'ordinal'
+    and 'days' days later. Integer arithmetic only: ordinal 1 (0001-01-01) is a Monday, so (ordinal - 1) // 7
+    is a week index ordered as ISO 8601 (year, week) tuples.
+
+    >>> _week_delta(datetime.date(2018, 12, 30).toordinal(), 1)  # sunday to monday
+    1
+    >>> _week_delta(datetime.date(2018, 12, 31).toordinal(), -1)
+    -1
+    >>> _week_delta(datetime.date(2019, 1, 1).toordinal(), 13)
+    2
+    """
+    return (ordinal + days - 1) // 7 - (ordinal - 1) // 7
+
+
+def _to_ns(date: pd.Series) -> np.ndarray:
+    """Nanoseconds since epoch of a serie of datetimes (int64 array, NaT values are meaningless)"""
+    return date.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+def _datetime_delta_series(date_1: Union[pd.Series, datetime.datetime, None],
+                           date_2: Union[pd.Series, datetime.datetime, None],
+                           period_type='day', abs_val=False) -> pd.Series:
+    """Vectorized version of datetime_delta when date_1 and/or date_2 is a pandas Series.
+    If both are series, they are compared element by element (extra elements are ignored, index is reset).
+    Otherwise, the scalar is compared to each element of the serie (index of the serie is kept)."""
+    if isinstance(date_1, pd.Series) and isinstance(date_2, pd.Series):
+        length = min(len(date_1), len(date_2))
+        date_1 = pd.to_datetime(date_1.iloc[:length]).reset_index(drop=True)
+        date_2 = pd.to_datetime(date_2.iloc[:length]).reset_index(drop=True)
+        name = None
+    elif isinstance(date_1, pd.Series):
+        date_1 = pd.to_datetime(date_1)
+        date_2 = pd.to_datetime(pd.Series(date_2, index=date_1.index))
+        name = date_1.name
+    else:
+        date_2 = pd.to_datetime(date_2)
+        date_1 = pd.to_datetime(pd.Series(date_1, index=date_2.index))
+        name = date_2.name
+    if period_type == "year":
+        res = date_2.dt.year - date_1.dt.year
+    elif period_type == 'quarter':
+        res = 4 * (date_2.dt.year - date_1.dt.year) + (date_2.dt.quarter - date_1.dt.quarter)
+    elif period_type == 'month':
+        res = 12 * (date_2.dt.year - date_1.dt.year) + (date_2.dt.month - date_1.dt.month)
+    elif period_type == 'week':  # ISO 8601, same kernel as the scalar case, on int64 arrays
+        local_1 = date_1 if date_1.dt.tz is None else date_1.dt.tz_localize(None)  # local dates, as toordinal
+        ordinal_1 = _to_ns(local_1) // _NS_PER_DAY + _EPOCH_ORDINAL
+        res = _week_delta(ordinal_1, (_to_ns(date_2) - _to_ns(date_1)) // _NS_PER_DAY)
+    elif period_type in _NS_PER_UNIT:
+        res = (_to_ns(date_2) - _to_ns(date_1)) // _NS_PER_UNIT[period_type]
+    else:
+        raise NotImplementedError(period_type)
+    if isinstance(res, np.ndarray):  # integer arithmetic on nanoseconds: NaT must be handled here
+        nat = (date_1.isna() | date_2.isna()).to_numpy()
+        res = pd.Series(np.where(nat, np.nan, res) if nat.any() else res, index=date_1.index)
+    res = np.abs(res) if abs_val else res
+    res = res.astype(np.int64) if not res.hasnans else res.astype(float)
+    res.name = name
+    return res
+
+
 def month_delta(date_1, date_2, abs_val=False):
     return datetime_delta(date_1, date_2, abs_val=abs_val, period_type="month")
 
@@ -449,14 +611,21 @@ def get_periods(date_start=None, date_end=None, nb_period=None, period_type=None
         return []
     if not date_start and not date_end:
         date_end = datetime.datetime.now()
+    # Bounds of the periods, computed from date_start or date_end (not from the previous bound)
+    offset = _TIMEDELTA_OFFSETS.get(period_type)
     if date_start:
         date_start = reset_period(date_start, period_type=period_type) if reset_periods else date_start
-        dates = [add_period(date_start, i, period_type=period_type) for i in range(nb_period)]
+        if offset is not None:
+            bounds = pd.date_range(start=date_start, periods=nb_period + 1, freq=offset).tolist()
+        else:
+            bounds = [add_period(date_start, i, period_type=period_type) for i in range(nb_period + 1)]
     elif date_end:
         date_end = reset_period(date_end, period_type=period_type) if reset_periods else date_end
-        dates = [add_period(date_end, -i - 1, period_type=period_type) for i in range(nb_period)]
-        dates.reverse()
-    periods = [(date, add_period(date, 1, period_type=period_type)) for date in dates]
+        if offset is not None:
+            bounds = pd.date_range(end=date_end, periods=nb_period + 1, freq=offset).tolist()
+        else:
+            bounds = [add_period(date_end, i - nb_period, period_type=period_type) for i in range(nb_period + 1)]
+    periods = list(zip(bounds[:-1], bounds[1:]))
     return periods
 
 
@@ -6,6 +6,7 @@ Configuration loaded from/saved to disk with INI syntax.
 As the configuration is a singleton (the configuration class can only have a unique instance),
 it can be accessed by calling Config class directly. For example:
 
+>>> from tools.helpers.config_manager import Config
 >>> CONFIG = Config()
 >>> CONFIG2 = Config()
 >>> CONFIG is CONFIG2
@@ -66,9 +67,16 @@ TODO
 TODO
 
 """
-from tools.helpers.config_manager.config_models import Config
-
 __all__ = ['Config',
            ]
 
 __version__ = '0.7.0'
+
+
+def __getattr__(name):
+    # Config is imported on first access only (config_models is slow to import)
+    if name == 'Config':
+        from tools.helpers.config_manager.config_models import Config
+        globals()['Config'] = Config
+        return Config
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
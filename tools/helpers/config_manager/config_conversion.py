@@ -4,16 +4,22 @@
 Functions to load/save configuration with typed values.
 """
 import ast
+import functools
+import json
 import re
+from types import MappingProxyType
 import pandas as pd
 from collections import OrderedDict
 
 from tools.logger import logger
-from tools.helpers.utils import isiterable
 from tools.helpers.models import Reference, Path
 
 DEFAULT_FLAG_START = r'@'
 DEFAULT_FLAG_END = r'-'
+DEFAULT_FLAG_PATTERN = r'^[{}]([a-z0-9]+)[{}]'
+DATE_BATCH_MIN_SIZE = 8  # minimum number of values with the same date flag to convert them at once
+# Since pandas 2, the format of the first date of a list is used for all the dates, unless format is 'mixed'
+_MIXED_DATES_KWARGS = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else {}
 
 
 def to_float(v, thousand_sep=None, decimal_sep=None):
@@ -24,6 +30,27 @@ def to_float(v, thousand_sep=None, decimal_sep=None):
     return float(v)
 
 
+def _float_converter(thousand_sep=None, decimal_sep=None):
+    """Returns a function equivalent to to_float with single-character separators,
+    that cleans the string in one str.translate pass.
+
+    >>> _float_converter(thousand_sep=' ', decimal_sep=',')('1 234,5')
+    1234.5
+    """
+    table = {}
+    if thousand_sep:
+        table[thousand_sep] = None
+    if decimal_sep:
+        table[decimal_sep] = '.'
+    table = str.maketrans(table)
+
+    def converter(v):
+        if not isinstance(v, str):  # same errors as to_float
+            return to_float(v, thousand_sep=thousand_sep, decimal_sep=decimal_sep)
+        return float(v.translate(table))
+    return converter
+
+
 def to_char(v):
     c = str(v)
     return c[0] if c else ''
@@ -42,58 +69,96 @@ def to_tuple(v, sep=','):  # deprecated, replaced by ast.literal_eval
     return tuple(to_list(v, sep=sep))
 
 
+_FALSE_STRINGS = frozenset({'False', 'false', 'None', 'none', '0', 'no', 'No', ''})
+
+
 def to_bool(v):
-    if v in ("False", "None"):
-        return False
+    """Converts v to bool. Strings in _FALSE_STRINGS are False, other strings are True.
+
+    >>> [to_bool(v) for v in ('False', 'no', '0', '', 'True', 'yes', 0)]
+    [False, False, False, False, True, True, False]
+    """
+    if isinstance(v, str):
+        return v not in _FALSE_STRINGS
     return bool(v)
 
 
+# Strings which have the same meaning in JSON and Python syntax: numbers, lists, dicts
+# and double-quoted strings without escape sequences (no true/false/null/NaN/Infinity)
+_JSON_STRING_REGEX = re.compile(r'"[^"\\]*"')
+_JSON_LITERAL_REGEX = re.compile(r'[ \t0-9.eE+\-\[\]{},:]*')
+
+
+def _fast_literal_eval(v):
+    """Same as ast.literal_eval, but json.loads (much faster) is used when possible.
+
+    >>> _fast_literal_eval('[1, 2.5, {"a": -3e2}]')
+    [1, 2.5, {'a': -300.0}]
+    >>> _fast_literal_eval("(None, 'a')")  # fallback to ast.literal_eval
+    (None, 'a')
+    """
+    if isinstance(v, str) and '\\' not in v and _JSON_LITERAL_REGEX.fullmatch(_JSON_STRING_REGEX.sub('', v)):
+        try:
+            return json.loads(v)
+        except ValueError:
+            pass
+    return ast.literal_eval(v)
+
+
 AUTO_FLAG = 'auto'
-CONVERSION_DICT = OrderedDict([
+CONVERSION_DICT = {
     # syntax: {prefix: (type, conversion_function_to_type), ...}
     # Conversions str <-> type
-    ('b', (bool, to_bool)),
-    ('d', (int, int)),
-    ('i', (int, int)),
-    ('ftws', (float, lambda v: to_float(v, thousand_sep=' '))),
-    ('ftc', (float, lambda v: to_float(v, thousand_sep=','))),  # English format
-    ('fdc', (float, lambda v: to_float(v, decimal_sep=','))),
-    ('fdd', (float, lambda v: to_float(v, decimal_sep='.'))),
-    ('ftwsdc', (float, lambda v: to_float(v, thousand_sep=' ', decimal_sep=','))),  # French format
-    ('f', (float, to_float)),
-    ('p', (Path, Path)),
-    ('r', (Reference, Reference)),  # TODO
-    ('c', (str, to_char)),
-    ('s', (str, str)),
-    ('date', (pd.Timestamp, pd.to_datetime)),
-    ('datedb', (pd.Timestamp, lambda v: pd.to_datetime(v, dayfirst=True))),
+    'b': (bool, to_bool),
+    'd': (int, int),
+    'i': (int, int),
+    'ftws': (float, _float_converter(thousand_sep=' ')),
+    'ftc': (float, _float_converter(thousand_sep=',')),  # English format
+    'fdc': (float, _float_converter(decimal_sep=',')),
+    'fdd': (float, _float_converter(decimal_sep='.')),
+    'ftwsdc': (float, _float_converter(thousand_sep=' ', decimal_sep=',')),  # French format
+    'f': (float, to_float),
+    'p': (Path, Path),
+    'r': (Reference, Reference),  # TODO
+    'c': (str, to_char),
+    's': (str, str),
+    'date': (pd.Timestamp, pd.to_datetime),
+    'datedb': (pd.Timestamp, functools.partial(pd.to_datetime, dayfirst=True)),
     # Auto flag
-    (AUTO_FLAG, (object, ast.literal_eval)),
+    AUTO_FLAG: (object, _fast_literal_eval),
     # Special conversions str -> list/tuple
-    ('lc', (list, lambda v: to_list(v, sep=','))),
-    ('lsc', (list, lambda v: to_list(v, sep=';'))),
-    ('ls', (list, lambda v: to_list(v, sep='/'))),
-    ('lbs', (list, lambda v: to_list(v, sep='\\'))),
-    ('lnl', (list, lambda v: to_list(v, sep='\n'))),
-    ('ld', (list, lambda v: to_list(v, sep='.'))),
-    ('lws', (list, lambda v: to_list(v, sep=' '))),
-    ('l', (list, to_list)),  # replaced by auto, more efficient.
-    ('t', (tuple, to_tuple)),  # replaced by auto, more efficient.
-])
-FILE_TO_KEY = {k: v[1] for k, v in CONVERSION_DICT.items()}
-KEY_TO_FILE = {v[0]: k for k, v in CONVERSION_DICT.items() if v[0] not in (list, tuple)}
-KEY_TO_FILE.update({list: AUTO_FLAG, tuple: AUTO_FLAG})
+    'lc': (list, functools.partial(to_list, sep=',')),
+    'lsc': (list, functools.partial(to_list, sep=';')),
+    'ls': (list, functools.partial(to_list, sep='/')),
+    'lbs': (list, functools.partial(to_list, sep='\\')),
+    'lnl': (list, functools.partial(to_list, sep='\n')),
+    'ld': (list, functools.partial(to_list, sep='.')),
+    'lws': (list, functools.partial(to_list, sep=' ')),
+    'l': (list, to_list),  # replaced by auto, more efficient.
+    't': (tuple, to_tuple),  # replaced by auto, more efficient.
+}
+# Read-only mappings: conversion plans and converters derived from them are cached
+FILE_TO_KEY = MappingProxyType({k: v[1] for k, v in CONVERSION_DICT.items()})
+KEY_TO_FILE = MappingProxyType({**{v[0]: k for k, v in CONVERSION_DICT.items() if v[0] not in (list, tuple)},
+                                list: AUTO_FLAG, tuple: AUTO_FLAG})
+
+
+def _empty_like(dico):
+    """Returns an empty dictionary-like object of the same type as dico (literal for the common dict type)."""
+    dico_type = type(dico)
+    if dico_type is dict:
+        return {}
+    if dico_type is OrderedDict:
+        return OrderedDict()
+    return dico_type()
 
 
 def _add_flags_to_key(key, flags=None, start='@', end='-', **_kwargs):
     if flags is None:
         return key
-    if isinstance(flags, str):
-        flags = [flags]
-    head = ""
-    for flag in flags:
-        head += "{}{}{}".format(start, flag, end)
-    return head + key
+    if isinstance(flags, str):  # most common case: a single flag
+        return start + flags + end + key
+    return "".join(["{}{}{}".format(start, flag, end) for flag in flags]) + key
 
 
 def convert_dict_to_str(dico, auto=True, inplace=False):
@@ -109,34 +174,55 @@ def convert_dict_to_str(dico, auto=True, inplace=False):
     >>> convert_dict_to_str(dico)
     {'@b-a': 'True', '@b-b': 'False', '@auto-c': 'None', '@auto-d': "[{(18, 3.1): 'a'}, 'end']", '@f-e': '9.9'}
     """
-    n_dico = type(dico)()
-    for k, v in dico.items():
-        flag = KEY_TO_FILE.get(type(v), KEY_TO_FILE.get(object, None) if auto else None)
-        n_k = _add_flags_to_key(k, flag)
-        n_dico[n_k] = str(v)
-    if inplace:
+    default_flag = KEY_TO_FILE.get(object, None) if auto else None
+    items = [(_add_flags_to_key(k, KEY_TO_FILE.get(type(v), default_flag)), str(v)) for k, v in dico.items()]
+    if inplace:  # dico is only modified once all items are converted
         dico.clear()
-        dico.update(n_dico)
-        return
-    return n_dico
+        n_dico = dico
+    else:
+        n_dico = _empty_like(dico)
+    for n_k, n_v in items:
+        n_dico[n_k] = n_v
+    return None if inplace else n_dico
+
 
+@functools.lru_cache(maxsize=16)
+def _get_converters(date_format=None):
+    """Returns FILE_TO_KEY if date_format is None,
+    else a copy of FILE_TO_KEY where dates ('date' and 'datedb' flags) are parsed with the format date_format."""
+    if date_format is None:
+        return FILE_TO_KEY
+    converters = dict(FILE_TO_KEY)
+    converters['date'] = converters['datedb'] = functools.partial(pd.to_datetime, format=date_format)
+    return converters
 
-def _single_item_conversion(item, key=None, error='ignore', drop_none=False, drop_empty_iterable=False):
+
+def _single_item_conversion(item, key=None, error='ignore', drop_none=False, drop_empty_iterable=False,
+                            converters=None):
     if key is None:
         logger.debug("Conversion bypassed because argument 'key' is None. Returning None.")
         return item
+    converters = FILE_TO_KEY if converters is None else converters
+    return _convert_item(item, converters.get(key, str), error=error, drop_none=drop_none,
+                         drop_empty_iterable=drop_empty_iterable)
+
+
+def _convert_item(item, converter, error='ignore', drop_none=False, drop_empty_iterable=False):
+    """Converts item (and its elements if it is iterable) with converter, resolved once from the flag."""
     try:
         if item is None:
             return None
-        if isiterable(item):  # if iterable object
-            _v = type(item)(_single_item_conversion(s_item, key=key, error=error,
-                                                    drop_none=drop_none, drop_empty_iterable=drop_empty_iterable)
-                            for s_item in item)
+        if isinstance(item, (list, tuple, set)):  # if iterable object
+            _v = [_convert_item(s_item, converter, error=error,
+                                drop_none=drop_none, drop_empty_iterable=drop_empty_iterable)
+                  for s_item in item]
+            if type(item) is not list:
+                _v = type(item)(_v)
         else:
-            _v = FILE_TO_KEY.get(key, str)(item)
+            _v = converter(item)
 
-        if drop_none and isiterable(_v):
-            _v = type(_v)(s_item for s_item in _v if s_item is not None)
+        if drop_none and isinstance(_v, (list, tuple, set)):
+            _v = type(_v)([s_item for s_item in _v if s_item is not None])
         if drop_empty_iterable and not _v:
             _v = None
     except (ValueError, TypeError, SyntaxError) as err:
@@ -164,39 +250,73 @@ def _single_item_conversion(item, key=None, error='ignore', drop_none=False, dro
 
 
 def _multiple_item_conversion(item, flags=None, error='ignore', drop_none=False, drop_empty_iterable=False,
-                              ascendant=False):
+                              ascendant=False, converters=None):
     if not flags:
         return item
     if ascendant:
         flags.reverse()
     if not isinstance(flags, (tuple, list)):
         raise TypeError("Type '{}' of flags argument '{}' is not taken in charge.".format(type(flags), flags))
-    return _process_multiple_item_conversion(item, flags=flags, error=error,
-                                             drop_none=drop_none, drop_empty_iterable=drop_empty_iterable)
+    for flag in flags:  # flags are applied from left to right
+        item = _single_item_conversion(item, flag, error=error, drop_none=drop_none,
+                                       drop_empty_iterable=drop_empty_iterable, converters=converters)
+    return item
 
 
-def _process_multiple_item_conversion(item, flags=None, error='ignore',
-                                      drop_none=False, drop_empty_iterable=False):
-    if len(flags) == 1:
-        return _single_item_conversion(item, flags[0], error=error,
-                                       drop_none=drop_none, drop_empty_iterable=drop_empty_iterable)
-    else:
-        return _single_item_conversion(
-            _process_multiple_item_conversion(item, flags[:-1], error=error,
-                                              drop_none=drop_none, drop_empty_iterable=drop_empty_iterable),
-            flags[-1], error=error, drop_none=drop_none, drop_empty_iterable=drop_empty_iterable)
+@functools.lru_cache(maxsize=16)
+def _get_flag_regex(pattern, start, end):
+    return re.compile(pattern.format(start, end))
+
+
+_DEFAULT_FLAG_REGEX = _get_flag_regex(DEFAULT_FLAG_PATTERN, DEFAULT_FLAG_START, DEFAULT_FLAG_END)
+
 
+def _scan_default_flags(key):
+    """Equivalent of the flag parsing with DEFAULT_FLAG_PATTERN, DEFAULT_FLAG_START and DEFAULT_FLAG_END,
+    without regular expressions.
 
-def _parse_key(key, pattern=r'^[{}]([a-z0-9]+)[{}]', start=DEFAULT_FLAG_START, end=DEFAULT_FLAG_END, **_kwargs):
-    ptrn = pattern.format(start, end)
-    regex = re.compile(ptrn)
+    >>> _scan_default_flags('@i-@auto-key')
+    ('key', ('i', 'auto'))
+    >>> _scan_default_flags('@I-key')
+    ('@I-key', ())
+    """
+    flags = []
+    while key.startswith(DEFAULT_FLAG_START):
+        end = key.find(DEFAULT_FLAG_END, 1)
+        flag = key[1:end]
+        # flag must match [a-z0-9]+
+        if end < 0 or not (flag.isalnum() and flag.isascii() and flag.lower() == flag):
+            break
+        flags.append(flag)
+        key = key[end + 1:]
+    return key, tuple(flags)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_key_cached(key, pattern, start, end):
+    """Returns the key without flags and the tuple of flags (cached: keys are often parsed many times)"""
+    if pattern is DEFAULT_FLAG_PATTERN and start == DEFAULT_FLAG_START and end == DEFAULT_FLAG_END:
+        if isinstance(key, str):
+            return _scan_default_flags(key)
+        regex = _DEFAULT_FLAG_REGEX
+    else:
+        regex = _get_flag_regex(pattern, start, end)
     flags = []  # list of flags
+    groups = regex.groups
+
+    def _remove_flag(match):  # collects the same items as regex.findall
+        flags.append(match.group(groups) if groups <= 1 else match.groups(""))
+        return ""
+
     found = 1
-    while found:
-        flags += regex.findall(key)
-        key, found = regex.subn("", key)
-    flags = flags or None
-    return key, flags
+    while found:  # flags are collected and removed in the same pass
+        key, found = regex.subn(_remove_flag, key)
+    return key, tuple(flags)
+
+
+def _parse_key(key, pattern=DEFAULT_FLAG_PATTERN, start=DEFAULT_FLAG_START, end=DEFAULT_FLAG_END, **_kwargs):
+    key, flags = _parse_key_cached(key, pattern, start, end)
+    return key, list(flags) or None  # new list: flags may be modified by the caller
 
 
 def _no_flag_handling(key, no_flag='ignore'):
@@ -214,7 +334,7 @@ def _no_flag_handling(key, no_flag='ignore'):
         raise ValueError(err_msg)
 
 
-def _handle_duplicates(dico, key, value, flag='first', inplace=False):
+def _handle_duplicates(dico, key, value, flag='first', inplace=False, rename_counters=None):
     """Handle duplicates in dico.
 
     :param dico: dico to update
@@ -222,9 +342,11 @@ def _handle_duplicates(dico, key, value, flag='first', inplace=False):
     :param value: value to set
     :param flag: 'first', 'last', 'rename' or 'error' (or whatever, which means 'error')
     :param inplace: modification of dico inplace if True
+    :param rename_counters: dict of the last index used to rename each key, updated by this function.
+                            Renamed keys must be kept in dico (inplace is True).
     :return: None if inplace is True, else dico updated
     """
-    n_dico = type(dico)()
+    n_dico = dico if inplace else _empty_like(dico)  # no intermediate mapping when modifying dico inplace
     if key in dico:
         logger.debug("Key '{}' is duplicated.".format(key))
         if flag == 'first':
@@ -232,28 +354,79 @@ def _handle_duplicates(dico, key, value, flag='first', inplace=False):
         elif flag == 'last':
             n_dico[key] = value
         elif flag == 'rename':
-            i = 0
-            exists = True
-            while exists:
+            i = rename_counters.get(key, 0) + 1 if rename_counters is not None else 1
+            while "{}_{}".format(key, i) in dico:
                 i += 1
-                n_key = "{}_{}".format(key, i)
-                exists = True if n_key in dico else False
-            n_dico[n_key] = value
+            if rename_counters is not None:
+                rename_counters[key] = i
+            n_dico["{}_{}".format(key, i)] = value
         else:
-            err_msg = "Duplicate keys '{}' found! Conversion process aborting."
+            err_msg = "Duplicate keys '{}' found! Conversion process aborting.".format(key)
             logger.error(err_msg)
             raise ValueError(err_msg)
     else:
         n_dico[key] = value
     if inplace:
-        dico.update(n_dico)
         return
     return n_dico
 
 
+def _batch_date_conversion(dico, date_format=None, **parser_cfg):
+    """Convert at once the string values of keys with a single date flag ('date' or 'datedb'),
+    if there are at least DATE_BATCH_MIN_SIZE values with the same flag.
+    If the conversion of a group fails, its values are not returned (they will be converted one by one).
+
+    :param dico: dictionary-like object to convert
+    :param date_format: format of the dates. If None, the format of each date is inferred.
+    :param parser_cfg: kwargs for _parse_key function
+    :return: dict of converted values (original keys as keys)
+    """
+    groups = {}
+    for k, v in dico.items():
+        if isinstance(v, str):
+            flags = _parse_key(k, **parser_cfg)[1]
+            if flags is not None and len(flags) == 1 and flags[0] in ('date', 'datedb'):
+                groups.setdefault(flags[0], []).append((k, v))
+    converted = {}
+    for flag, items in groups.items():
+        if len(items) < DATE_BATCH_MIN_SIZE:
+            continue
+        try:
+            values = [v for _, v in items]
+            if date_format is None:
+                dates = pd.to_datetime(values, dayfirst=flag == 'datedb', **_MIXED_DATES_KWARGS)
+            else:
+                dates = pd.to_datetime(values, format=date_format)
+        except (ValueError, TypeError, OverflowError):
+            logger.debug("Batch conversion of '{}' values failed. Values are converted one by one.".format(flag))
+            continue
+        converted.update(zip((k for k, _ in items), dates))
+    return converted
+
+
+@functools.lru_cache(maxsize=64)
+def _conversion_plan(keys, allow_multiple, parser_items, date_format=None):
+    """Returns, for each key of keys, the tuple (key without flags, flags, converter).
+    converter is the conversion function if there is a single flag, else None.
+    Cached because dictionaries with the same keys (e.g. a configuration reloaded) are often converted many times.
+
+    >>> _conversion_plan(('@i-a', '@f-@i-b', 'c'), True, ())
+    (('a', ('i',), <class 'int'>), ('b', ('f', 'i'), None), ('c', (), None))
+    """
+    parser_cfg = dict(parser_items)
+    converters = _get_converters(date_format)
+    plan = []
+    for k in keys:
+        n_k, flags = _parse_key(k, **parser_cfg)
+        flags = tuple(flags[:1] if not allow_multiple else flags) if flags else ()
+        converter = converters.get(flags[0], str) if len(flags) == 1 else None
+        plan.append((n_k, flags, converter))
+    return tuple(plan)
+
+
 def convert_dict_from_str(dico, allow_multiple=True, error='ignore', drop_none=False,
                           drop_empty_iterable=False, ascendant=False, no_flag='ignore',
-                          inplace=False, duplicates='first', **parser_cfg):
+                          inplace=False, duplicates='first', date_format=None, **parser_cfg):
     """Convert a dict of str (generated from a file for example) to a typed dict.
     Simple types that can be recognised: str, bool, int, float, list, tuple.
     Custom classes: Reference, Path
@@ -272,6 +445,8 @@ def convert_dict_from_str(dico, allow_multiple=True, error='ignore', drop_none=F
     :param no_flag: behavior if no flag found. 'ignore', 'error', 'drop', 'auto-conversion'
     :param inplace: returns dico inplace
     :param duplicates: behavior if duplicates found. 'drop', 'first', 'last', 'error'.
+    :param date_format: format of the dates (flags 'date' and 'datedb'), e.g. '%d/%m/%Y'.
+                        If None (default), the format of each date is inferred (slower).
     :param parser_cfg: kwargs for _parse_key function
     :return: dictionary-like object (same type as 'dico')
 
@@ -305,6 +480,8 @@ def convert_dict_from_str(dico, allow_multiple=True, error='ignore', drop_none=F
     >>> date_special_dict = {"@date-date_std": "04/11/2018", "@datedb-date_day_before": "04/11/2018"}
     >>> convert_dict_from_str(date_special_dict)
     {'date_std': Timestamp('2018-04-11 00:00:00'), 'date_day_before': Timestamp('2018-11-04 00:00:00')}
+    >>> convert_dict_from_str(date_special_dict, date_format='%d/%m/%Y')
+    {'date_std': Timestamp('2018-11-04 00:00:00'), 'date_day_before': Timestamp('2018-11-04 00:00:00')}
 
     # List test
 
@@ -323,19 +500,28 @@ def convert_dict_from_str(dico, allow_multiple=True, error='ignore', drop_none=F
     if dico is None:
         logger.warning("none as dict")
         return None
-    n_dico = type(dico)()
-    for k, v in dico.items():
-        n_k, flags = _parse_key(k, **parser_cfg)
-        if not allow_multiple:
-            flags = flags[0] if flags else None
+    n_dico = _empty_like(dico)
+    rename_counters = {}
+    converters = _get_converters(date_format)
+    dates = _batch_date_conversion(dico, date_format=date_format, **parser_cfg) if allow_multiple else {}
+    plan = _conversion_plan(tuple(dico.keys()), allow_multiple, tuple(sorted(parser_cfg.items())), date_format)
+    for (k, v), (n_k, flags, converter) in zip(dico.items(), plan):
         if not flags:
             flags = _no_flag_handling(k, no_flag=no_flag)
             if flags is None:
                 continue
-        n_v = _multiple_item_conversion(v, flags, error=error, drop_none=drop_none,
-                                        drop_empty_iterable=drop_empty_iterable, ascendant=ascendant)
+            converter = converters.get(flags[0], str) if flags else None
+        if k in dates:
+            n_v = dates[k]
+        elif converter is not None:  # most common case: a single flag
+            n_v = _convert_item(v, converter, error=error, drop_none=drop_none,
+                                drop_empty_iterable=drop_empty_iterable)
+        else:
+            n_v = _multiple_item_conversion(v, list(flags), error=error, drop_none=drop_none,
+                                            drop_empty_iterable=drop_empty_iterable, ascendant=ascendant,
+                                            converters=converters)
         if n_v is not None or not drop_none:
-            _handle_duplicates(n_dico, n_k, n_v, duplicates, inplace=True)
+            _handle_duplicates(n_dico, n_k, n_v, duplicates, inplace=True, rename_counters=rename_counters)
     if inplace:
         dico.clear()
         dico.update(n_dico)
@@ -4,9 +4,11 @@
 Dictionary-like classes used in configuration.
 """
 import configparser
+import os
 from collections import defaultdict, OrderedDict
 from copy import copy, deepcopy
 import datetime
+from types import MappingProxyType
 from typing import Union
 
 from tools.logger import logger
@@ -14,27 +16,49 @@ from tools.helpers.models import Path, Reference, Wildcard, BaseDict
 from tools.helpers.utils import merge_dict_preprocessing
 from tools.helpers.config_manager.config_conversion import convert_dict_from_str, convert_dict_to_str
 
-_DEFAULT_DICT = OrderedDict
+_DEFAULT_DICT = dict  # ordered since Python 3.7
+_IMMUTABLE_TYPES = frozenset({str, int, float, bool, type(None), datetime.datetime})  # values never copied
+
+
+_KEY_CACHE = {}  # str -> key, filled by to_key
+_KEY_CACHE_MAX_SIZE = 4096
 
 
 def to_key(*args):
-    """Converts the last argument into a valid key of SectionDict."""
+    """Converts the last argument into a valid key of SectionDict.
+
+    >>> to_key(' My_Key'), to_key(3)
+    ('my_key', '3')
+    """
     if not args:
         raise TypeError("{} takes at least 1 argument (0 given)".format(to_key.__name__))
     obj = args[-1]
+    is_str = type(obj) is str
+    if is_str:  # keys are often the same strings
+        n_str = _KEY_CACHE.get(obj)
+        if n_str is not None:
+            return n_str
     try:
         n_str = str(obj).lower().strip()  # case insensitive
     except TypeError as te:
         logger.exception(te)
         return None
+    if is_str and len(_KEY_CACHE) < _KEY_CACHE_MAX_SIZE:
+        _KEY_CACHE[obj] = n_str
     return n_str
 
 
 def to_section(*args):
-    """Converts the last argument into a valid section of ConfigDict."""
+    """Converts the last argument into a valid section of ConfigDict.
+
+    >>> to_section(' My Section '), to_section(3)
+    ('My Section', '3')
+    """
     if not args:
         raise TypeError("{} takes at least 1 argument (0 given)".format(to_section.__name__))
     obj = args[-1]
+    if type(obj) is str:  # most common case, str() can not fail
+        return obj.strip()  # case sensitive
     try:
         n_str = str(obj).strip()  # case sensitive
     except TypeError as te:
@@ -45,15 +69,17 @@ def to_section(*args):
 
 class SectionDict(BaseDict):
     """Dictionary-like class."""
+    __slots__ = ('_policies',)  # no __dict__: only the policies and the dictionary are stored
 
     # Class attributes
     _ALLOWED_TYPES = (str, int, float, list, tuple, Path, Reference, datetime.datetime)
-    _BASE_POLICY = defaultdict(bool, {'setprivattr': True,  # mandatory
-                                      'chprivattr': True,  # mandatory
-                                      'setitem': True,
-                                      'clear': True,
-                                      'forbid_none_value': False,
-                                      })
+    _ALLOWED_TYPE_SET = frozenset(_ALLOWED_TYPES)  # exact types, checked before isinstance
+    _BASE_POLICY = MappingProxyType({'setprivattr': False,  # mandatory
+                                     'chprivattr': False,  # mandatory
+                                     'setitem': True,
+                                     'clear': True,
+                                     'forbid_none_value': False,
+                                     })  # shared by the instances until their own policies are accessed
     _POLICIES = '__policies__'
     _CONFIG = '_cfg'
     TO_KEY_FUNC = to_key
@@ -65,16 +91,39 @@ class SectionDict(BaseDict):
     # Builtin methods #
     ###################
 
-    def __init__(self, dico=None, auto_cast=False):  # Overridden method of BaseDict
-        self.__policies__ = self._BASE_POLICY.copy()
-        super().__init__()
-        self._cfg = self._DEFAULT_DICT()
-        self._build(dico, auto_cast=auto_cast)
-        self.__policies__['setprivattr'] = False
-        self.__policies__['chprivattr'] = False
+    def __init__(self, dico=None, auto_cast=False, copy_values=True):  # Overridden method of BaseDict
+        """
+        :param dico: dictionary-like object
+        :param auto_cast: if True, auto cast values to the correct Python type
+        :param copy_values: if False, values of dico are not (deep)copied. Use it only if dico is not used elsewhere.
+        """
+        object.__setattr__(self, '_policies', None)  # bypasses the policies check
+        object.__setattr__(self, self._CONFIG, self._DEFAULT_DICT())
+        self._build(dico, auto_cast=auto_cast, deepcopy_values=copy_values, copy_values=copy_values)
+
+    @property
+    def __policies__(self):
+        """Policies of the instance, copied from the class policies at first access.
+
+        >>> sd1, sd2 = SectionDict(), SectionDict()
+        >>> sd1.__policies__['setitem'] = False
+        >>> sd1._get_policy('setitem'), sd2._get_policy('setitem'), SectionDict._BASE_POLICY['setitem']
+        (False, True, True)
+        """
+        policies = self._policies
+        if policies is None:
+            policies = defaultdict(bool, self._BASE_POLICY)
+            object.__setattr__(self, '_policies', policies)
+        return policies
+
+    def _get_policy(self, name) -> bool:
+        policies = self._policies
+        return (self._BASE_POLICY if policies is None else policies).get(name, False)
 
     @classmethod
     def _check_allowed_value_type(cls, value):
+        if type(value) in cls._ALLOWED_TYPE_SET:
+            return True
         if value is None:
             if cls._BASE_POLICY['forbid_none_value']:
                 return False
@@ -90,8 +139,7 @@ class SectionDict(BaseDict):
     def _new(cls, dico, auto_cast=False, deepcopy_values=True, copy_values=True, **conversion_kwargs):
         """Returns a dictionary-like object which can be set as '_cfg' attribute.
 
-        :param conversion_kwargs: keywords arguments for convert_dict_from_str,
-        except 'inplace' which is automatically True.
+        :param conversion_kwargs: keywords arguments for convert_dict_from_str, except 'inplace' which is ignored.
         """
         if isinstance(dico, list):
             try:
@@ -119,7 +167,9 @@ class SectionDict(BaseDict):
                     logger.warning("keys with different case not allowed. "
                                    "key '{}' dropped. renaming not implemented.".format(k))
                     continue
-                if deepcopy_values:
+                if type(v) in _IMMUTABLE_TYPES:  # no copy needed
+                    pass
+                elif deepcopy_values:
                     v = deepcopy(v)
                 elif copy_values:
                     v = copy(v)
@@ -130,8 +180,8 @@ class SectionDict(BaseDict):
         if auto_cast:
             if 'no_flag' not in conversion_kwargs:
                 conversion_kwargs['no_flag'] = 'auto-conversion'
-            conversion_kwargs['inplace'] = True
-            convert_dict_from_str(o_dict, **conversion_kwargs)
+            conversion_kwargs['inplace'] = False  # o_dict is not used elsewhere: the converted dict replaces it
+            o_dict = convert_dict_from_str(o_dict, **conversion_kwargs)
         return o_dict
 
     def _build(self, dico, update=False, auto_cast=False, deepcopy_values=True, copy_values=True):
@@ -141,11 +191,11 @@ class SectionDict(BaseDict):
         >>> sd._build({"a": 2, "b": 6}, update=False)
         >>> sd
         SectionDict:
-        OrderedDict([('a', 2), ('b', 6)])
+        {'a': 2, 'b': 6}
         >>> sd._build({"b": 5, "c": 7}, update=True)
         >>> sd
         SectionDict:
-        OrderedDict([('a', 2), ('b', 5), ('c', 7)])
+        {'a': 2, 'b': 5, 'c': 7}
 
         :param dico: dictionary-like object
         :param update: if False, clear the current self._cfg dictionary before updating it
@@ -185,8 +235,16 @@ class SectionDict(BaseDict):
         >>> sd[9]
         5
         """
-        if self.__policies__['setitem']:
-            self._build({key: value}, update=True)
+        self._raw_setitem(self.TO_KEY_FUNC(key), value)
+
+    def _raw_setitem(self, key, value):
+        """Set item whose key is already converted with TO_KEY_FUNC. Like __setitem__, the value is deepcopied."""
+        if not self._get_policy('setitem'):
+            return
+        if not self._check_allowed_value_type(value) or not key:
+            logger.error("Input items '({}, {})' not taken in charge.".format(key, value))
+            return
+        self._cfg[key] = value if type(value) in _IMMUTABLE_TYPES else deepcopy(value)
 
     def __getattr__(self, item):
         """ Get item using getattr method
@@ -199,16 +257,19 @@ class SectionDict(BaseDict):
         """
         if item.startswith("_"):
             return super().__getattribute__(item)
-        try:
-            return self[item]
-        except KeyError as ke:
-            raise AttributeError(ke)
+        n_item = self.TO_KEY_FUNC(item)
+        cfg = self._cfg
+        if n_item in cfg:  # membership test rather than KeyError handling
+            return cfg[n_item]
+        raise AttributeError(item)
 
     def __setattr__(self, key, value):  # Overridden methods of BaseDict
         if key.startswith("_"):
-            _key_bool = key in dir(self)
-            if (not _key_bool and (key == self._POLICIES or self.__policies__['setprivattr'])) \
-                    or (_key_bool and self.__policies__['chprivattr']):
+            # same as 'key in dir(self)', without building and sorting the list of all attributes
+            # (instances have no __dict__: their attributes are slots, defined in the classes)
+            _key_bool = any(key in klass.__dict__ for klass in type(self).__mro__)
+            if (not _key_bool and (key == self._POLICIES or self._get_policy('setprivattr'))) \
+                    or (_key_bool and self._get_policy('chprivattr')):
                 return super().__setattr__(key, value)
             else:
                 logger.error("Forbidden! The policy does not allow to set the private attribute '{}'.".format(key))
@@ -217,7 +278,7 @@ class SectionDict(BaseDict):
 
     def __delitem__(self, key):
         key = self.TO_KEY_FUNC(key)
-        if self.__policies__['delitem']:
+        if self._get_policy('delitem'):
             del self._cfg[key]
             return self
         else:
@@ -226,7 +287,7 @@ class SectionDict(BaseDict):
 
     def __delattr__(self, name):  # Overridden method of object
         if name.startswith("_"):
-            if self.__policies__['delprivattr']:
+            if self._get_policy('delprivattr'):
                 return super(self.__class__, self).__delattr__(name)
             else:
                 logger.error("Forbidden! The policy does not allow to delete the private attribute '{}'.".format(name))
@@ -234,9 +295,24 @@ class SectionDict(BaseDict):
         return self.__delitem__(name)
 
     def __eq__(self, other):
-        if not isinstance(other, SectionDict):
-            other = self.__class__(other)
-        return self._cfg == other._cfg
+        """
+        >>> SectionDict({'a': 1, 'B': [2]}) == {'A': 1, 'b': [2]}, SectionDict({'a': 1}) == {'a': 1, 'b': {}}
+        (True, True)
+        """
+        if isinstance(other, SectionDict):
+            return self._cfg == other._cfg
+        cfg = self._cfg
+        if isinstance(other, dict) and len(other) <= len(cfg):
+            # Converting other to a SectionDict can only drop items: compare without building it
+            seen = set()
+            for k, v in other.items():
+                n_k = self.TO_KEY_FUNC(k)
+                if n_k not in cfg or n_k in seen or not self._check_allowed_value_type(v) or cfg[n_k] != v:
+                    return False
+                seen.add(n_k)
+            return len(seen) == len(cfg)
+        other = self.__class__(other)
+        return cfg == other._cfg
 
     ##################
     # Public methods #
@@ -244,7 +320,7 @@ class SectionDict(BaseDict):
 
     # Overridden methods of BaseDict
     def setdefault(self, k, default=None):
-        if self.__policies__['setitem']:
+        if self._get_policy('setitem'):
             k = self.TO_KEY_FUNC(k)
             self.merge({k: default}, how='append', inplace=True)  # TODO policies / copy ?
             return self[k]
@@ -252,17 +328,27 @@ class SectionDict(BaseDict):
             logger.error("Forbidden! The policy does not allow to set items in the SectionDict.")
 
     def clear(self):
-        if self.__policies__['clear']:
+        if self._get_policy('clear'):
             self._build(None, update=False)
         else:
             logger.error("Forbidden! The policy does not allow to clear the SectionDict.")
 
     def update(self, other):
+        if isinstance(other, SectionDict):
+            other = other._cfg
+        if type(other) in (dict, OrderedDict):  # fast path, equivalent to an 'outer' merge
+            self._build(other, update=True)
+            return None
         self.merge(other, how='outer', inplace=True)
         return None
 
     # Added methods
-    def merge(self, section_dict, how='outer', inplace=False):
+    def merge(self, section_dict, how='outer', inplace=False, copy_values=True):
+        """Merge section_dict into self (or a copy of self if inplace is False).
+
+        :param copy_values: if False, values of section_dict are not (deep)copied.
+                            Use it only if section_dict is not used elsewhere.
+        """
         if not isinstance(section_dict, (dict, SectionDict)):
             logger.error("bad type for dict_to_merge")
             return self
@@ -271,24 +357,31 @@ class SectionDict(BaseDict):
         else:
             left_dict = self.deepcopy()
         right_dict = section_dict
-        m_dict = self._merge_dict(left_dict, right_dict, how=how)
+        m_dict = self._merge_dict(left_dict, right_dict, how=how, copy_values=copy_values)
         return None if inplace else m_dict
 
     @staticmethod
-    def _merge_dict(left_dict, right_dict, how='outer'):
+    def _merge_dict(left_dict, right_dict, how='outer', copy_values=True):
         if not isinstance(left_dict, __class__):
             left_dict = __class__(left_dict)
-        keys, update = merge_dict_preprocessing(left_dict, right_dict, how=how)
-        left_dict._build({k: right_dict[k] for k in keys}, update=update)
+        # keys of a SectionDict are already converted
+        right_cfg = right_dict._cfg if isinstance(right_dict, __class__) else right_dict
+        if how in ('outer', 'update'):  # most common case: all the items of right_dict
+            left_dict._build(right_cfg, update=True, deepcopy_values=copy_values, copy_values=copy_values)
+            return left_dict
+        if how == 'append':  # new keys, in the order of right_dict
+            left_cfg = left_dict._cfg
+            keys, update = [k for k in right_cfg if k not in left_cfg], True
+        else:
+            keys, update = merge_dict_preprocessing(left_dict, right_dict, how=how)
+        left_dict._build({k: right_cfg[k] for k in keys}, update=update,
+                         deepcopy_values=copy_values, copy_values=copy_values)
         # logger.debug("Merge '{}' ok.".format(how))
         return left_dict
 
     def to_str(self, write_flags=False):
-        string = ""
         sec_dict = convert_dict_to_str(self) if write_flags else self
-        for k, v in sec_dict.items():
-            string += "{} = {}\n".format(k, v)
-        return string
+        return "".join(["{} = {}\n".format(k, v) for k, v in sec_dict.items()])
 
 
 ########################################################################################################################
@@ -302,27 +395,30 @@ class ConfigDict(BaseDict):
     >>> def_conf_d = ConfigDict({'a': {1: 5, 2: 6, 5: 7}, 2: {1: 8, 3: 9}, 'other': {1: 10, 4: 11}})
     >>> conf_d = ConfigDict({'a': {1: 12, 2: 13, 6: 14}, 2: {1: 15}, 'other2': {1: 16, 4: 17}})
     >>> conf_d.config
-    OrderedDict([('a', SectionDict:
-    OrderedDict([('1', 12), ('2', 13), ('6', 14)])), ('2', SectionDict:
-    OrderedDict([('1', 15)])), ('other2', SectionDict:
-    OrderedDict([('1', 16), ('4', 17)]))])
+    {'a': SectionDict:
+    {'1': 12, '2': 13, '6': 14}, '2': SectionDict:
+    {'1': 15}, 'other2': SectionDict:
+    {'1': 16, '4': 17}}
     >>> conf_d.config = conf_d
     >>> conf_d.config
-    OrderedDict([('a', SectionDict:
-    OrderedDict([('1', 12), ('2', 13), ('6', 14)])), ('2', SectionDict:
-    OrderedDict([('1', 15)])), ('other2', SectionDict:
-    OrderedDict([('1', 16), ('4', 17)]))])
+    {'a': SectionDict:
+    {'1': 12, '2': 13, '6': 14}, '2': SectionDict:
+    {'1': 15}, 'other2': SectionDict:
+    {'1': 16, '4': 17}}
     >>> conf_d.config = def_conf_d
     >>> conf_d.config
-    OrderedDict([('a', SectionDict:
-    OrderedDict([('1', 5), ('2', 6), ('5', 7)])), ('2', SectionDict:
-    OrderedDict([('1', 8), ('3', 9)])), ('other', SectionDict:
-    OrderedDict([('1', 10), ('4', 11)]))])
+    {'a': SectionDict:
+    {'1': 5, '2': 6, '5': 7}, '2': SectionDict:
+    {'1': 8, '3': 9}, 'other': SectionDict:
+    {'1': 10, '4': 11}}
     """
+    __slots__ = ('_default_section', '_section', '_conversion_dict')
     TO_KEY_FUNC = to_section
     _DEFAULT_DICT = _DEFAULT_DICT
     _ALLOWED_TYPES = (dict, OrderedDict, configparser.ConfigParser)
     _WILDCARD = object()
+    _FILE_CACHE = OrderedDict()  # (path, auto_cast, encoding) -> ((mtime_ns, size), ConfigDict), LRU order
+    _FILE_CACHE_MAX_SIZE = 32
 
     def __init__(self, dico=None, auto_cast=False, default_section=_WILDCARD, section=_WILDCARD):
         super().__init__()
@@ -349,7 +445,7 @@ class ConfigDict(BaseDict):
             return None
         if isinstance(dico, (list, zip, map)):  # todo: simpler way
             try:
-                dico = OrderedDict(dico)
+                dico = cls._DEFAULT_DICT(dico)
             except TypeError:
                 logger.error("Bad format for '{}' object".format(dico))
                 return None
@@ -358,9 +454,57 @@ class ConfigDict(BaseDict):
             logger.error("Bad type '{}' for object '{}'. Expected '{}' object."
                          .format(type(dico), dico, " or ".join([str(t) for t in _new_allowed_types])))
             return None
-        dico = OrderedDict([(cls.TO_KEY_FUNC(key), SectionDict(section, auto_cast=auto_cast))
-                            for key, section in dico.items()])
-        return dico
+        f_dico = cls._DEFAULT_DICT()
+        for key, section in dico.items():
+            f_dico[cls.TO_KEY_FUNC(key)] = SectionDict(section, auto_cast=auto_cast)
+        return f_dico
+
+    @classmethod
+    def from_file(cls, path, auto_cast=False, encoding='utf-8') -> 'ConfigDict':
+        """Returns a ConfigDict read from a INI file.
+        The parsed file is cached: it is parsed again only if its modification time or size has changed.
+        Configparser errors are not caught."""
+        path = os.path.abspath(path)
+        try:
+            stat = os.stat(path)
+        except OSError:  # no file: configparser returns an empty configuration
+            stat = None
+        cache_key = (path, auto_cast, encoding)
+        signature = None if stat is None else (stat.st_mtime_ns, stat.st_size)
+        cached = cls._FILE_CACHE.get(cache_key)
+        if signature is not None and cached is not None and cached[0] == signature:
+            logger.debug("Configuration file '{}' unchanged: cached configuration used.".format(path))
+            cls._FILE_CACHE.move_to_end(cache_key)
+            return deepcopy(cached[1])
+        config_parser = configparser.ConfigParser()
+        if stat is not None:
+            try:  # whole file read at once, then parsed from memory
+                with open(path, mode='r', encoding=encoding) as file:
+                    data = file.read()
+            except OSError:  # e.g. directory or unreadable file: ignored, as configparser does
+                data = None
+            if data is not None:
+                config_parser.read_string(data, source=path)
+        config_dict = cls(config_parser, auto_cast=auto_cast)
+        if signature is None:
+            cls._FILE_CACHE.pop(cache_key, None)
+        else:
+            cls._FILE_CACHE[cache_key] = (signature, deepcopy(config_dict))
+            cls._FILE_CACHE.move_to_end(cache_key)
+            if len(cls._FILE_CACHE) > cls._FILE_CACHE_MAX_SIZE:
+                cls._FILE_CACHE.popitem(last=False)  # least recently used
+        return config_dict
+
+    @classmethod
+    def clear_file_cache(cls, path=None) -> None:
+        """Removes the configurations read from path (or all of them if path is None) from the cache of from_file.
+        To be called when a file is written, in case its modification time and size are unchanged."""
+        if path is None:
+            cls._FILE_CACHE.clear()
+            return
+        path = os.path.abspath(path)
+        for cache_key in [cache_key for cache_key in cls._FILE_CACHE if cache_key[0] == path]:
+            del cls._FILE_CACHE[cache_key]
 
     # Conversion dict
     # for key, type_v in conversion_dict.items():  # TODO
@@ -384,41 +528,57 @@ class ConfigDict(BaseDict):
     def __getitem__(self, item):
         key = to_key(item)
         # section = self.TO_KEY_FUNC(item)
-        if self.section and key in self._cfg[self.section]:  # First, search in current section
-            return self._cfg[self.section][key]
-        elif self.default_section and key in self._cfg[self.default_section]:  # Then, search in default section
-            return self._cfg[self.default_section][key]
+        cfg = self._cfg
+        # First, search in current section, then in default section
+        for section in (self._section, self._default_section):
+            if section:
+                section_cfg = cfg[section]._cfg  # key is already converted
+                if key in section_cfg:
+                    return section_cfg[key]
         # elif section in self:  # Then, search in sections (bad practice)
         #     logger.warning("Bad practice to access section '{}' by getitem. "
         #                    "Do prefer 'get_section' method.".format(section))
         #     return self.get_section(section=item, set_section=False)
-        else:  # Finally raises an error if nothing found
-            err_msg = "'{}' is not a valid key for the current configuration".format(item)
-            logger.debug(err_msg)
-            raise KeyError(err_msg)
+        # Finally raises an error if nothing found
+        err_msg = "'{}' is not a valid key for the current configuration".format(item)
+        logger.debug(err_msg)
+        raise KeyError(err_msg)
 
     def get(self, item: str, default=None):
-        try:
-            return self[item]
-        except KeyError:
-            return default
+        """Same search as __getitem__, without raising and catching a KeyError if item is not found."""
+        key = to_key(item)
+        cfg = self._cfg
+        for section in (self._section, self._default_section):
+            if section:
+                section_cfg = cfg[section]._cfg if section in cfg else None
+                if section_cfg is None:  # section removed: __getitem__ raises a KeyError
+                    return default
+                if key in section_cfg:
+                    return section_cfg[key]
+        return default
 
     def __setitem__(self, key, value):
-        key = self.TO_KEY_FUNC(key)
+        key = to_key(key)  # key of SectionDict, converted once for all the lookups below
+        cfg, section, default_section = self._cfg, self._section, self._default_section
+        section_dict = cfg[section] if section else None
+        default_dict = None
         # If key already exists in section, update section
-        if self.section and key in self._cfg[self.section]:
-            self._cfg[self.section][key] = value
+        if section_dict is not None and key in section_dict._cfg:
+            section_dict._raw_setitem(key, value)
+            return
+        if default_section:
+            default_dict = cfg[default_section]
         # If key already exists in default section, update default section
-        elif self.default_section and key in self._cfg[self.default_section]:
-            self._cfg[self.default_section][key] = value
+        if default_dict is not None and key in default_dict._cfg:
+            default_dict._raw_setitem(key, value)
         # If section is not None, i.e. exists, set value in section
-        elif self.section:
-            self._cfg[self.section][key] = value
+        elif section_dict is not None:
+            section_dict._raw_setitem(key, value)
         # If default section is not None, i.e. exists, set value in default section
-        elif self.default_section:
+        elif default_dict is not None:
             logger.debug("Item '({}, {})' set in default_section '{}' "
-                         "because no section is set.".format(key, value, self.default_section))
-            self._cfg[self.default_section][key] = value
+                         "because no section is set.".format(key, value, default_section))
+            default_dict._raw_setitem(key, value)
         # If no section nor default section, error
         else:
             logger.error("No section nor default_section is defined! Setting item is not possible!\n"
@@ -435,18 +595,26 @@ class ConfigDict(BaseDict):
         >>> ConfigDict({1: {8: 2}}) == ConfigDict({1: SectionDict({8:2})})
         True
         """
-        if not isinstance(other, ConfigDict):
-            other = ConfigDict(other)
-        return self._cfg == other._cfg
+        if isinstance(other, ConfigDict):
+            return self._cfg == other._cfg
+        cfg = self._cfg
+        if isinstance(other, dict) and len(other) <= len(cfg):
+            # Converting other to a ConfigDict can only drop duplicated sections: compare without building it
+            seen = set()
+            for section, section_dict in other.items():
+                n_section = self.TO_KEY_FUNC(section)
+                if n_section not in cfg or n_section in seen or cfg[n_section] != section_dict:
+                    return False
+                seen.add(n_section)
+            return len(seen) == len(cfg)
+        other = ConfigDict(other)
+        return cfg == other._cfg
 
     def to_str(self, write_flags=False) -> str:
-        string = "# ConfigDict object representation\n"
-        for section in self:
-            string += "[{}]\n".format(section)
-            sec_dict = self.get_section(section, set_section=False)
-            string += sec_dict.to_str(write_flags=write_flags)
-            string += '\n'
-        return string
+        parts = ["# ConfigDict object representation\n"]
+        for section, sec_dict in self._cfg.items():
+            parts.append("[{}]\n{}\n".format(section, sec_dict.to_str(write_flags=write_flags)))
+        return "".join(parts)
 
     def __str__(self):
         return self.to_str()
@@ -488,13 +656,13 @@ class ConfigDict(BaseDict):
             logger.error("Bad section to set: '{}'!".format(section))
 
     def add_section(self, section, section_dict=None, auto_cast=False,
-                    exist_ok=False, set_section=False) -> None:
+                    exist_ok=False, set_section=False, copy_values=True) -> None:
         section = None if section is None else self.TO_KEY_FUNC(section)
         if section in self:
             if not exist_ok:
                 logger.error("Section '{}' already exists!".format(section))
         else:
-            self._cfg[section] = SectionDict(section_dict, auto_cast=auto_cast)
+            self._cfg[section] = SectionDict(section_dict, auto_cast=auto_cast, copy_values=copy_values)
         logger.debug("Section '{}' added.".format(section))
         if set_section:
             self._section = section
@@ -528,7 +696,7 @@ class ConfigDict(BaseDict):
         self._section = name
 
     def sections(self) -> list:  # function, not property, like Configparser.
-        return [section for section in self]
+        return list(self._cfg)
 
     @property
     def config(self) -> Union[_DEFAULT_DICT, None]:
@@ -544,34 +712,49 @@ class ConfigDict(BaseDict):
 
     @property
     def isempty(self) -> bool:
-        ls_empty = [ele for ele in self.values()]
-        return not (True in ls_empty)
+        """True if there is no section or if all sections are empty.
+
+        >>> ConfigDict({'a': {}, 'b': {}}).isempty, ConfigDict({'a': {}, 'b': {1: 2}}).isempty
+        (True, False)
+        """
+        return not any(self._cfg.values())
 
     @property
-    def isnone(self) -> bool:
+    def isnone(self) -> bool:  # alias of isempty, like Path.isempty and Path.isnone
         return self.isempty
 
     @staticmethod
     def merge_config_dict(left_dict: 'ConfigDict', right_dict: 'ConfigDict',
-                          how='outer', how_section=None) -> 'ConfigDict':
-        """Modify left_dict inplace, updated with right_dict"""
+                          how='outer', how_section=None, copy_values=True) -> 'ConfigDict':
+        """Modify left_dict inplace, updated with right_dict.
+        If copy_values is False, values of right_dict are not copied (right_dict must not be used elsewhere)."""
         how_section = how if how_section is None else how_section
-        keys, update = merge_dict_preprocessing(left_dict, right_dict, how=how)
+        left_cfg, right_cfg = left_dict._cfg, right_dict._cfg  # keys are already formatted sections
+        if not left_cfg and how in ('outer', 'right', 'append'):  # empty left_dict: every section is new
+            for k, section in right_cfg.items():
+                left_cfg[k] = SectionDict(section, copy_values=copy_values)
+            logger.debug("Merge into an empty ConfigDict ok.")
+            return left_dict
+        if how == 'append':  # new sections, in the order of right_dict
+            keys, update = [k for k in right_cfg if k not in left_cfg], True
+        else:
+            keys, update = merge_dict_preprocessing(left_dict, right_dict, how=how)
         if not update:
             left_dict.clear()
             logger.debug("Left dict cleared.")
         for k in keys:
-            if k in left_dict:  # Section already exists
-                left_dict.get_section(k).merge(right_dict.get_section(k), how=how_section, inplace=True)
+            if k in left_cfg:  # Section already exists
+                left_cfg[k].merge(right_cfg[k], how=how_section, inplace=True, copy_values=copy_values)
             else:
-                left_dict.add_section(k, right_dict.get_section(k))
+                left_cfg[k] = SectionDict(right_cfg[k], copy_values=copy_values)
         logger.debug("Merge successful (ConfigDict method:  '{}', "
                      "SectionDict method: '{}') ok.".format(how, how_section))
         return left_dict
 
     def merge(self, config_dict: Union[dict, 'ConfigDict'], how='outer', how_section=None,
               inplace=False, deepcopy_right=True) -> Union['ConfigDict', None]:
-        if not isinstance(config_dict, ConfigDict):
+        owned = not isinstance(config_dict, ConfigDict)  # if True, config_dict is a new object built from copies
+        if owned:
             config_dict = ConfigDict(config_dict)
         if config_dict is None:
             logger.error("bad type for config_dict")
@@ -580,8 +763,10 @@ class ConfigDict(BaseDict):
             left_dict = self
         else:
             left_dict = self.deepcopy()
-        right_dict = config_dict.deepcopy() if deepcopy_right else config_dict
-        n_config_dict = self.merge_config_dict(left_dict, right_dict, how=how, how_section=how_section)
+        right_dict = config_dict.deepcopy() if deepcopy_right and not owned else config_dict
+        # values of the deepcopy (or of the new ConfigDict) can be used directly
+        n_config_dict = self.merge_config_dict(left_dict, right_dict, how=how, how_section=how_section,
+                                               copy_values=not (deepcopy_right or owned))
         return None if inplace else n_config_dict
 
     def update(self, other: Union[dict, 'ConfigDict']) -> None:
@@ -4,6 +4,7 @@
 Configuration classes.
 """
 import io
+import os
 import configparser
 from collections import defaultdict, OrderedDict
 from typing import Union
@@ -41,19 +42,19 @@ class _Config(BaseDict):
     ('default', 'default')
     >>> config.config
     ConfigDict:
-    OrderedDict([('default', SectionDict:
-    OrderedDict([('1', 5), ('2', 6), ('5', 7)])), ('2', SectionDict:
-    OrderedDict([('1', 8), ('3', 9)])), ('other', SectionDict:
-    OrderedDict([('1', 10), ('4', 11)]))])
+    {'default': SectionDict:
+    {'1': 5, '2': 6, '5': 7}, '2': SectionDict:
+    {'1': 8, '3': 9}, 'other': SectionDict:
+    {'1': 10, '4': 11}}
     >>> config.config = conf_d
     >>> (config.section, config.default_section)
     ('default', 'default')
     >>> config.config
     ConfigDict:
-    OrderedDict([('default', SectionDict:
-    OrderedDict([('1', 12), ('2', 13), ('6', 14)])), ('2', SectionDict:
-    OrderedDict([('1', 15)])), ('other2', SectionDict:
-    OrderedDict([('1', 16), ('4', 17)]))])
+    {'default': SectionDict:
+    {'1': 12, '2': 13, '6': 14}, '2': SectionDict:
+    {'1': 15}, 'other2': SectionDict:
+    {'1': 16, '4': 17}}
     >>> config[1]
     12
     >>> config['2']
@@ -68,11 +69,11 @@ class _Config(BaseDict):
     'other'
     >>> config.config
     ConfigDict:
-    OrderedDict([('default', SectionDict:
-    OrderedDict([('1', 12), ('2', 13), ('6', 14), ('5', 7)])), ('2', SectionDict:
-    OrderedDict([('1', 15)])), ('other2', SectionDict:
-    OrderedDict([('1', 16), ('4', 17)])), ('other', SectionDict:
-    OrderedDict([('1', 10), ('4', 11)]))])
+    {'default': SectionDict:
+    {'1': 12, '2': 13, '6': 14, '5': 7}, '2': SectionDict:
+    {'1': 15}, 'other2': SectionDict:
+    {'1': 16, '4': 17}, 'other': SectionDict:
+    {'1': 10, '4': 11}}
     """
     _WILDCARD = Wildcard()
     EDITABLE_ATTR = ["path", "config", "default_config", "default_section", "section"]
@@ -111,6 +112,47 @@ class _Config(BaseDict):
              search_in_default_config: bool = True, merge_default_how: str = 'right', **kwargs):
         """cf. __init__
 
+        With auto_load and merge_default_how='right', the default configuration is copied only if nothing is loaded.
+        The result is the same as a copy of the default configuration merged with the loaded one:
+
+        >>> import os, shutil, tempfile
+        >>> default = {DEFAULT_SECTION: {1: 5}, 2: {1: 8, 3: 9}, 'other': {4: 11}}
+        >>> def eager_config(loaded=None):  # copy of the default configuration, then merge of the loaded one
+        ...     expected = ConfigDict(default)
+        ...     return expected if loaded is None else ConfigDict.merge_config_dict(expected, loaded, how='right')
+        >>> def same(config, expected):
+        ...     return config.config == expected and config.sections() == expected.sections()
+
+        No configuration file:
+
+        >>> config = _Config(default_config=default, ask_path=False)
+        >>> same(config, eager_config())
+        True
+
+        Empty configuration file:
+
+        >>> tmp_dir = tempfile.mkdtemp()
+        >>> path = os.path.join(tmp_dir, 'config.ini')
+        >>> open(path, 'w').close()
+        >>> config = _Config(default_config=default, path=path, ask_path=False)
+        >>> same(config, eager_config(_Config.read_config(path)))
+        True
+
+        load raises: default values are copied anyway
+
+        >>> class _FailingConfig(_Config):
+        ...     @classmethod
+        ...     def read_config(cls, *args, **kwargs):
+        ...         raise OSError("read failed")
+        >>> config = _FailingConfig()
+        >>> config.init(default_config=default, path=path, ask_path=False)
+        Traceback (most recent call last):
+        ...
+        OSError: read failed
+        >>> same(config, eager_config())
+        True
+        >>> shutil.rmtree(tmp_dir)
+
         :param path: path of the current configuration file.
         :param default_config: default configuration dictionary-like object with two levels.
         Preferred type is ConfigDict.
@@ -152,7 +194,13 @@ class _Config(BaseDict):
         self._conversion_dict = conversion_dict
         # Load default config
         self._default_config = ConfigDict(default_config)
-        self._cfg = self.default_config.deepcopy()  # first current configuration, before load  # todo: needed?
+        # First current configuration, before load. If the loaded configuration replaces it ('right' merge),
+        # only the default sections are created (for the section setters): values are copied if nothing is loaded.
+        lazy_default = auto_load and merge_default_how == 'right'
+        if lazy_default:
+            self._cfg = ConfigDict({section: {} for section in self._default_config.keys()})
+        else:
+            self._cfg = self.default_config.deepcopy()
         # Sections
         if not isinstance(default_section, str):
             default_section = DEFAULT_SECTION
@@ -165,7 +213,12 @@ class _Config(BaseDict):
         self._default_path = self._path.copy() or Path(path)  # if path is None, keep the first path
         # Load configuration from file
         if auto_load:
-            self.load(merge_how=merge_default_how)
+            loaded = None
+            try:
+                loaded = self.load(merge_how=merge_default_how)
+            finally:  # also if load raises: the default values must be there
+                if lazy_default and not loaded:
+                    self._cfg.merge(self.default_config, how='outer', how_section='append', inplace=True)
         self._init_count += 1
         logger.debug("Config initialized. Number of initialization(s): {}".format(self._init_count))
 
@@ -197,19 +250,20 @@ class _Config(BaseDict):
 
     # Get values
     def __getitem__(self, item):
-        if item in self._temp_config:  # 1st, try to find the key in temp config
+        temp_config = self._temp_config
+        if temp_config and item in temp_config:  # 1st, try to find the key in temp config
             logger.debug("temporary config used for key '{}'".format(item))
-            return self._temp_config[item]
-        try:
-            return self._cfg[item]  # 2nd, try to find the key in current config
-        except KeyError as _err_msg:
-            try:  # 3rd, try to find the key in default config TODO: use search in default config
-                res = self._default_config[item]
-                logger.debug("Item '{}' found in default configuration instead of current configuration.".format(item))
-                self._cfg[item] = res  # set item to current configuration
-                return res
-            except KeyError as err_msg:
-                raise KeyError(err_msg)
+            return temp_config[item]
+        res = self._cfg.get(item, self._WILDCARD)  # 2nd, try to find the key in current config
+        if res is not self._WILDCARD:
+            return res
+        # 3rd, try to find the key in default config TODO: use search in default config
+        res = self._default_config.get(item, self._WILDCARD)
+        if res is self._WILDCARD:
+            raise KeyError("'{}' is not a valid key for the current configuration".format(item))
+        logger.debug("Item '{}' found in default configuration instead of current configuration.".format(item))
+        self._cfg[item] = res  # set item to current configuration
+        return res
 
     def get(self, item, default=None):
         try:
@@ -255,18 +309,23 @@ class _Config(BaseDict):
         if kwargs:  # if other kwargs
             raise TypeError("Keyword arguments '{}' are not supported".format(kwargs.keys()))
         key = args[1] if len(args) >= 2 else args[0]
+        # Each section is got once (get_section checks the section and can add it from the default configuration)
         # search in the section of the current configuration
-        if key in self.get_section(section):
-            return self.get_section(section)[key]
+        section_dict = self.get_section(section)
+        if key in section_dict:
+            return section_dict[key]
         # search in the default section of the current configuration
-        elif key in self.get_section(self.default_section):
-            return self.get_section(self.default_section)[key]
+        section_dict = self.get_section(self.default_section)
+        if key in section_dict:
+            return section_dict[key]
         # search in the section of the default configuration
-        elif key in self._default_config.get_section(section) and self._search_in_default_config:
-            return self._default_config.get_section(section)[key]
+        default_config = self._default_config
+        section_dict = default_config.get_section(section)
+        if key in section_dict and self._search_in_default_config:
+            return section_dict[key]
         # search in the default section of the default configuration
-        elif key in self._default_config.get_section(self.default_section) and self._search_in_default_config:
-            return self._default_config.get_section(self._default_config.default_section)[key]
+        if key in default_config.get_section(self.default_section) and self._search_in_default_config:
+            return default_config.get_section(default_config.default_section)[key]
         elif default is not self._WILDCARD:
             return default
         else:
@@ -291,8 +350,8 @@ class _Config(BaseDict):
         section = None if section is None else ConfigDict.TO_KEY_FUNC(section)
         search_in_default_config = self._search_in_default_config if search_in_default_config is None \
             else search_in_default_config
-        if section not in self.sections() and section is not None and search_in_default_config:
-            # if the section doesn't exist, append the default configuration to the configuration
+        if section is not None and search_in_default_config and section not in self._cfg.keys():
+            # if the section doesn't exist, append the section of the default configuration to the configuration
             self.add_default_config_sections(sections=section)
             # self.reload_default(write=False, how='append')  # old method
             logger.debug("Section(s) '{}' of default configuration appended to config.".format(section))
@@ -397,7 +456,7 @@ class _Config(BaseDict):
         self._cfg.section = name
 
     def sections(self):  # function, not property, like Configparser.
-        return [section for section in self]
+        return self._cfg.sections()
 
     @property
     def default_config(self):  # TODO : copy ?
@@ -431,13 +490,14 @@ class _Config(BaseDict):
         return self.config
 
     def load(self, path=None, force_load=None, auto_cast=None, load_empty=None, merge_how='right'):
-        """Load configuration from file.
+        """Load configuration from file. Returns True if the configuration has been loaded.
         If force-load, reload_default values on error.."""
         path = self._path if path is None else Path(path)
         auto_cast = self._auto_cast if auto_cast is None else auto_cast
         force_load = self._force_load if force_load is None else force_load
         load_empty = self._load_empty if load_empty is None else load_empty
-        if not path.isfile:
+        is_file = path.isfile  # file system checked once
+        if not is_file:
             if force_load:
                 self.reload_default()
             return None
@@ -446,7 +506,7 @@ class _Config(BaseDict):
             if force_load:
                 self.reload_default()
             return None
-        elif path.isfile:  # Change path
+        elif is_file:  # Change path
             self._path = path
             logger.debug("Path changed to '{}' with 'load' method.".format(self.path))
         elif config_dict.isempty:
@@ -461,14 +521,28 @@ class _Config(BaseDict):
         # config_dict._conversion_dict = self._conversion_dict
         self.merge(config_dict, how=merge_how, inplace=True)
         logger.info("Configuration loaded!")
+        return True
+
+    def _get_default_sections(self, sections=None):
+        """Returns the default configuration if sections is None, else a dict of its sections in 'sections'.
+        Nothing is copied: merge copies what it uses."""
+        default_config = self.default_config
+        if sections is None:
+            return default_config
+        sections = sections if isinstance(sections, (list, tuple, set, frozenset)) else [sections]
+        sections = {ConfigDict.TO_KEY_FUNC(section) for section in sections}
+        return {k: default_config.get_section(k) for k in default_config.keys() if k in sections}
 
     def add_default_config_sections(self, sections=None, add_empty_sections=False):
-        dico = self.default_config.deepcopy()
-        sections = {sections} if isinstance(sections, str) else sections
-        n_dico = {k: dico[k] for k in sections & dico} if sections is None else dico
-        if add_empty_sections:
-            for section in sections:
+        """Appends the sections of the default configuration (in 'sections', or all of them if sections is None)
+        which are missing in the current configuration.
+        If add_empty_sections, 'sections' are first added to the current configuration, empty, if they are missing."""
+        if add_empty_sections and sections is not None:
+            for section in (sections if isinstance(sections, (list, tuple, set, frozenset)) else [sections]):
                 self.add_section(section, exist_ok=True)
+        # Only the sections to append are copied (by merge)
+        default_sections, current_sections = self._get_default_sections(sections), self._cfg.keys()
+        n_dico = {k: section for k, section in default_sections.items() if k not in current_sections}
         self.merge(n_dico, how='append', inplace=True)
 
     def reload_default(self, write=True, backup=True, how='right', how_section=None, sections=None):
@@ -476,9 +550,7 @@ class _Config(BaseDict):
         If write is True, overwrite default file with default configuration."""
         # self._cfg = self.default_config.deepcopy()
         self._path = self._default_path.copy()
-        dico = self.default_config.deepcopy()
-        sections = {sections} if isinstance(sections, str) else sections
-        n_dico = dico if sections is None else {k: dico[k] for k in sections & dico.keys()}
+        n_dico = self._get_default_sections(sections)
         self.merge(n_dico, how=how, how_section=how_section, inplace=True)
         if write:
             self.save_config(overwrite=True, backup=backup)
@@ -499,10 +571,9 @@ class _Config(BaseDict):
     def read_config(cls, path, auto_cast=True, anomaly_flag='warning'):
         """Returns a config_dict read from a INI file."""
         # WARNING: No check of input arguments !
-        # Read the configuration file with configparser
-        config_parser = configparser.ConfigParser()
+        # Read the configuration file with configparser (cached while the file is unchanged)
         try:
-            config_parser.read(path, encoding=ENCODING)
+            return ConfigDict.from_file(path, auto_cast=auto_cast, encoding=ENCODING)
         except (configparser.Error, ValueError, KeyError, TypeError) as err:
             logger.exception(err)
             msg = "The configuration could not be loaded!\n" \
@@ -511,7 +582,6 @@ class _Config(BaseDict):
             raise_anomaly(flag=anomaly_flag, error=err.__class__,
                           title="Configuration loading failed!", message=msg)
             return None
-        return ConfigDict(config_parser, auto_cast=auto_cast)
 
     # Write methods
     def save_config(self, path=None, overwrite=True, backup=False, auto_mkdir=True,
@@ -561,6 +631,7 @@ class _Config(BaseDict):
         try:
             with open(path, mode='w', encoding=ENCODING, newline=None) as file:
                 config_parser.write(file)
+            ConfigDict.clear_file_cache(path)  # written here, not by write_config
         except (configparser.Error, PermissionError, FileNotFoundError) as err:
             logger.exception(err)
             msg = "Configuration could not be written to disk!\n" \
@@ -577,10 +648,18 @@ class _Config(BaseDict):
         # WARNING: No check of input arguments !
         # config_dict = convert_dict_to_str(config_dict) if write_flags else config_dict  # WRONG: ConfigDict not convertible!
         # Write Configparser object to disk
+        # The whole content is written at once to a temporary file, which then replaces the configuration file:
+        # the configuration file is never left truncated or partially written.
+        content = config_dict.to_str(write_flags=write_flags)
+        tmp_path = "{}.tmp".format(path)
         try:
-            with open(path, mode='w', encoding=ENCODING, newline=None) as file:
-                file.write(config_dict.to_str(write_flags=write_flags))
+            with open(tmp_path, mode='w', encoding=ENCODING, newline=None) as file:
+                file.write(content)
+            os.replace(tmp_path, path)
+            ConfigDict.clear_file_cache(path)
         except (configparser.Error, PermissionError, FileNotFoundError) as err:
+            if os.path.isfile(tmp_path):
+                os.remove(tmp_path)
             logger.exception(err)
             msg = "Configuration could not be written to disk!\n" \
                   "Original error: {}".format(err)
@@ -6,6 +6,42 @@ Dictionary-like classes
 from collections import UserDict, OrderedDict
 from copy import copy, deepcopy
 
+_ATOMIC_TYPES = frozenset({str, int, float, bool, type(None)})  # types returned as is by deepcopy
+_SLOTS_CACHE = {}  # class -> (names of the slots, True if instances have a __dict__), filled by _get_slots
+
+
+def _get_slots(cls):
+    """Returns the names of the slots of cls (including its bases) and True if instances of cls have a __dict__."""
+    try:
+        return _SLOTS_CACHE[cls]
+    except KeyError:
+        pass
+    names, has_dict = [], False
+    for klass in cls.__mro__[:-1]:  # object excluded
+        slots = klass.__dict__.get('__slots__')
+        if slots is None:  # class without __slots__
+            has_dict = True
+            continue
+        slots = (slots,) if isinstance(slots, str) else slots
+        names.extend(name for name in slots if name not in ('__dict__', '__weakref__'))
+        has_dict = has_dict or '__dict__' in slots
+    _SLOTS_CACHE[cls] = (tuple(names), has_dict)
+    return _SLOTS_CACHE[cls]
+
+
+def _get_state(obj):
+    """Returns the list of the (attribute, value) of obj, from its slots and its __dict__."""
+    names, has_dict = _get_slots(type(obj))
+    state = []
+    for name in names:
+        try:
+            state.append((name, object.__getattribute__(obj, name)))
+        except AttributeError:  # slot not set
+            pass
+    if has_dict:
+        state.extend(object.__getattribute__(obj, '__dict__').items())
+    return state
+
 
 class IdentityDict(UserDict):
     """Dict which returns the key if key not in dict when getting item.
@@ -22,6 +58,7 @@ class IdentityDict(UserDict):
 
 class BaseDict:
     """Base class of ordered-dictionary-like objects where keys have a specified format."""
+    __slots__ = ('_cfg',)
     TO_KEY_FUNC = lambda _, x: x  # function to convert a key to a specified format
     _DEFAULT_DICT = OrderedDict
 
@@ -70,6 +107,45 @@ class BaseDict:
     def deepcopy(self):
         return deepcopy(self)
 
+    def __deepcopy__(self, memo):
+        """Deepcopy without the generic (and slow) reduce protocol. Immutable values of the dictionary are not copied.
+
+        >>> b = BaseDict({'a': [1], 'b': 2})
+        >>> c = deepcopy(b)
+        >>> c['a'].append(3)
+        >>> b['a'], c['a']
+        ([1], [1, 3])
+        """
+        cls = self.__class__
+        new = cls.__new__(cls)
+        memo[id(self)] = new
+        for attr, value in _get_state(self):
+            if attr == '_cfg':  # shallow copy (in C), then deepcopy of the mutable values only
+                n_value = value.copy()
+                for k, v in value.items():
+                    if type(v) not in _ATOMIC_TYPES:
+                        n_value[k] = deepcopy(v, memo)
+                value = n_value
+            else:
+                value = deepcopy(value, memo)
+            object.__setattr__(new, attr, value)  # attributes are set directly, as the default deepcopy does
+        return new
+
+    def __setstate__(self, state):
+        """Used by copy and pickle. Attributes are set directly, like the default behavior without slots.
+
+        >>> b = BaseDict({'a': [1]})
+        >>> c = copy(b)
+        >>> c['a'] is b['a']
+        True
+        """
+        if isinstance(state, tuple):  # (__dict__ or None, slots)
+            state, slots_state = state
+            for attr, value in (slots_state or {}).items():
+                object.__setattr__(self, attr, value)
+        for attr, value in (state or {}).items():
+            object.__setattr__(self, attr, value)
+
     def setdefault(self, k, default=None):
         k = self.TO_KEY_FUNC(k)
         self._cfg.setdefault(k, default)
@@ -88,19 +164,49 @@ class BaseDict:
         return self._cfg.items()
 
     def update(self, other):
-        self.update(other)
+        """
+        >>> b = BaseDict({'a': 1})
+        >>> b.update({'b': 2})
+        >>> b
+        BaseDict:
+        OrderedDict([('a', 1), ('b', 2)])
+        """
+        self._cfg.update([(self.TO_KEY_FUNC(k), v) for k, v in self._DEFAULT_DICT(other).items()])
         return None
 
     def pop(self, item, default=None):
         return self._cfg.pop(item, default)
 
-    def popitem(self, item):
-        return self._cfg.popitem(item)
+    def popitem(self, last=True):
+        if isinstance(self._cfg, OrderedDict):
+            return self._cfg.popitem(last)
+        if last:
+            return self._cfg.popitem()
+        if not self._cfg:
+            raise KeyError('popitem(): dictionary is empty')
+        key = next(iter(self._cfg))
+        return key, self._cfg.pop(key)
 
     # "Inherited" from OrderedDict
-    def move_to_end(self, key):
+    def move_to_end(self, key, last=True):
+        """Moves an existing key to the end (or the beginning if last is False), also if _cfg is a dict.
+
+        >>> b = BaseDict({'a': 1, 'b': 2, 'c': 3})
+        >>> b._cfg = dict(b._cfg)
+        >>> b.move_to_end('a'); b.move_to_end('c', last=False); list(b)
+        ['c', 'b', 'a']
+        """
         key = self.TO_KEY_FUNC(key)
-        return self._cfg.move_to_end(key)
+        if isinstance(self._cfg, OrderedDict):
+            return self._cfg.move_to_end(key, last)
+        value = self._cfg.pop(key)
+        if last:
+            self._cfg[key] = value
+        else:
+            items = list(self._cfg.items())
+            self._cfg.clear()
+            self._cfg[key] = value
+            self._cfg.update(items)
 
     # Inspired by pandas dataframe
     @classmethod
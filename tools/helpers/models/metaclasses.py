@@ -8,16 +8,23 @@ The syntax to use a metaclass in Python 3 is as follows:
 class MyClass(metaclass=MyMetaClass):
     pass
 """
+import threading
 
 
 class Singleton(type):
-    """Metaclass that authorize only one instance of a class."""
+    """Metaclass that authorize only one instance of a class.
+    The instance is created and initialized at the first call only, the next calls return it directly."""
     _instances = {}
+    _lock = threading.RLock()  # reentrant: a singleton can be created during the initialization of another one
 
     def __call__(cls, *args, **kwargs):
-        if cls not in cls._instances:
-            cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
-        return cls._instances[cls]
+        instance = cls._instances.get(cls)  # no lock once the instance exists
+        if instance is None:
+            with Singleton._lock:  # not cls._lock, which a singleton class could shadow
+                instance = cls._instances.get(cls)
+                if instance is None:  # not created by another thread in the meantime
+                    instance = cls._instances[cls] = super(Singleton, cls).__call__(*args, **kwargs)
+        return instance
 
 
 class LockChangeAttr(type):